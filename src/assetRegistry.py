@@ -0,0 +1,94 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+
+class AssetRegistry:
+    """
+    Class that decodes every image only once and shares the surfaces (converted to the display pixel format)
+    between all screens and sprites
+    """
+
+    def __init__(self):
+        """
+        Initializes the image cache and the hit/miss counters
+        """
+        self.images = {}
+        self.unconverted = set()
+        # (path, alpha) -> Future of the decoding in the thread pool
+        self.pending = {}
+        self.executor = None
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, alpha=False):
+        """
+        Function that returns the surface of an image and decodes it only on the first request
+        :param path: path of the image file
+        :param alpha: keep per pixel alpha (convert_alpha) or use the plain display format (convert)
+        :return: pygame.Surface
+        """
+        key = (path, alpha)
+        image = self.images.get(key)
+
+        if image is None:
+            self.misses += 1
+            future = self.pending.pop(key, None)
+            # preloaded images are (usually) decoded already
+            image = future.result() if future is not None else pygame.image.load(path)
+            self.unconverted.add(key)
+        else:
+            self.hits += 1
+
+        # conversion needs a display mode -> images requested before set_mode() are converted later
+        if key in self.unconverted and pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+            self.unconverted.discard(key)
+
+        self.images[key] = image
+        return image
+
+    def preload(self, keys, workers=4):
+        """
+        Function that decodes images in a thread pool (pygame.image.load releases the GIL), e.g. while the window is
+        created, the conversion to the display format is done by image() in the main thread
+        :param keys: list of tuples (path, alpha)
+        :param workers: number of decoding threads
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        for key in keys:
+            if key not in self.images and key not in self.pending:
+                self.pending[key] = self.executor.submit(pygame.image.load, key[0])
+
+    def wait(self):
+        """
+        Function that waits until all preloaded images are decoded and stops the thread pool
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def stats(self):
+        """
+        Function for the cache statistics
+        :return: dict with hits, misses and the number of cached images
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": len(self.images)
+        }
+
+    def report(self):
+        """
+        Logs the cache statistics
+        """
+        logger.info("asset registry: %s", self.stats())
+
+
+# shared by GameObject, Player, GameScreen and MenuScreen
+assets = AssetRegistry()
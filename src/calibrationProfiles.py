@@ -0,0 +1,91 @@
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CalibrationProfiles:
+    """
+    Class for the on-disk store of the calibration results per user and headset, returning players skip the
+    calibration of the signal thresholds
+    """
+
+    def __init__(self, path="calibration_profiles.json", max_age=30 * 24 * 3600):
+        """
+        :param path: path of the profile file
+        :param max_age: seconds a profile is used (the fit of the headset changes over time)
+        """
+        self.path = path
+        self.max_age = max_age
+        self.profiles = {}
+
+    @staticmethod
+    def key(user, headset_id):
+        return "{0}/{1}".format(user, headset_id)
+
+    @staticmethod
+    def valid(profile):
+        """
+        Function that checks the thresholds of a profile: between 0 and 1 and below the max. calibration power
+        (a threshold at the max. power would lock the player out)
+        :param profile: dict with the thresholds "left" and "right" and the calibration summary
+        :return: boolean
+        """
+        if not isinstance(profile, dict):
+            return False
+        summary = profile.get("summary") or {}
+        for direction in ("left", "right"):
+            threshold = profile.get(direction)
+            if not isinstance(threshold, (int, float)) or not 0.0 < threshold < 1.0:
+                return False
+            calibration_max = (summary.get(direction.upper()) or {}).get("max")
+            if calibration_max is not None and threshold >= calibration_max:
+                return False
+        return True
+
+    def load(self):
+        """
+        Function that reads all profiles (at startup)
+        """
+        try:
+            with open(self.path) as file:
+                self.profiles = json.load(file)
+        except (OSError, ValueError):
+            self.profiles = {}
+        if not isinstance(self.profiles, dict):
+            logger.warning("calibration profiles ignored: %s is not a profile file", self.path)
+            self.profiles = {}
+
+    def get(self, user, headset_id):
+        """
+        Function for the profile of a user and headset
+        :param user: user name
+        :param headset_id: id of the cortex headset
+        :return: dict with the thresholds "left" and "right" (and the calibration summary) or None
+        """
+        profile = self.profiles.get(self.key(user, headset_id))
+        if not self.valid(profile) or time.time() - profile.get("time", 0) > self.max_age:
+            return None
+        return profile
+
+    def store(self, user, headset_id, profile):
+        """
+        Function that adds the profile of a user and headset and writes all profiles
+        :param user: user name
+        :param headset_id: id of the cortex headset
+        :param profile: dict with the thresholds "left" and "right"
+        :return: boolean (False -> invalid thresholds, not stored)
+        """
+        if not self.valid(profile):
+            logger.warning("calibration profile of %s (%s) not stored, invalid thresholds: left %s right %s",
+                           user, headset_id, profile.get("left"), profile.get("right"))
+            return False
+        profile = dict(profile, time=time.time())
+        self.profiles[self.key(user, headset_id)] = profile
+        try:
+            with open(self.path, "w") as file:
+                json.dump(self.profiles, file, indent=1)
+        except OSError as error:
+            logger.warning("calibration profiles not written: %s", error)
+        return True
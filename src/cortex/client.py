@@ -7,13 +7,29 @@ class CortexClient:
      Class for setting up the factory and init additional info for connection
     """
 
-    def __init__(self, credentials, receiver, url="wss://localhost:6868"):
+    def __init__(self, credentials, receiver, url="wss://localhost:6868", recorder=None, session_cache=None,
+                 streams=("com",)):
         """
         Factory initialisation
         :param credentials: user credentials from user_credentials.py
-        :param receiver: pointer to an InputManger class
+        :param receiver: pointer to an InputManger class or a list with one InputManager per headset
         :param url: Cortex API url
+        :param recorder: optional CommandRecorder for all received mental commands
+        :param session_cache: optional SessionCache for the cortex token and session
+        :param streams: names of the subscribed data streams
         """
-        factory = CortexClientFactory(url, credentials, receiver)
+        self.factory = CortexClientFactory(url, credentials, receiver, recorder, session_cache, streams)
         # if secure -> ssl, if not -> tcp
-        connectWS(factory)
+        connectWS(self.factory)
+
+    def stop(self):
+        """
+        Function to call before the reactor stops: the closed connection is not reconnected
+        """
+        self.factory.stopTrying()
+
+    def stats(self):
+        """
+        :return: dict with the reconnect metrics (reconnects, samples lost, time to recover)
+        """
+        return self.factory.stats()
@@ -1,22 +1,161 @@
+import logging
+import time
+
 from autobahn.twisted.websocket import WebSocketClientFactory
+from twisted.internet.protocol import ReconnectingClientFactory
 from src.cortex.clientProtocol import CortexClientProtocol
 
+logger = logging.getLogger(__name__)
+
 
-class CortexClientFactory(WebSocketClientFactory):
+class CortexClientFactory(WebSocketClientFactory, ReconnectingClientFactory):
     """
      Class for twisted client factory (Twisted-based WebSocket client factories) to combine additional parameters
-     of the client with the receiver
+     of the client with the receiver, reconnects with jittered exponential backoff if the connection is lost
     """
     # from WebSocketClientFactory protocol
     protocol = CortexClientProtocol
 
-    def __init__(self, url, credentials, receiver):
+    # from ReconnectingClientFactory: delays 0.5 s, 1 s, 2 s, ... up to 5 s, each +-25%
+    initialDelay = 0.5
+    factor = 2.0
+    maxDelay = 5.0
+    jitter = 0.25
+
+    # samples per second of the "com" stream, until the rate of a connection is measured
+    nominal_sample_rate = 8.0
+
+    def __init__(self, url, credentials, receiver, recorder=None, session_cache=None, streams=("com",)):
         """
         Set up WebSocketClientFactory and init variables
         :param url: Cortex API url
         :param credentials: user credentials from user_credentials.py
-        :param receiver: pointer to an InputManger class
+        :param receiver: pointer to an InputManger class or a list with one InputManager per headset
+        :param recorder: optional CommandRecorder
+        :param session_cache: optional SessionCache to skip the handshake after a restart
+        :param streams: names of the subscribed data streams ("com", "eeg", "pow", "met", ...)
         """
         WebSocketClientFactory.__init__(self, url)
-        self.receiver = receiver
+        # one receiver per headset, samples are routed by their session
+        self.receivers = list(receiver) if isinstance(receiver, (list, tuple)) else [receiver]
+        self.receiver = self.receivers[0]
         self.credentials = credentials
+        self.recorder = recorder
+        self.session_cache = session_cache
+        self.streams = streams
+        # token and sessions of the last connection, reused after a reconnect
+        self.session = None
+        # time to first sample
+        self.time_started = time.perf_counter()
+        self.time_first_sample = None
+
+        # reconnect metrics
+        self.time_disconnected = None
+        self.reconnects = 0
+        self.recover_times = []
+        self.samples_lost = 0
+        # stream of the current connection: cortex times of the first and last sample
+        self.connection_samples = 0
+        self.connection_first_time = None
+        self.last_sample_time = None
+        self.sample_rate = None
+
+    def load_session(self):
+        """
+        :return: dict with headset_ids, auth_token and session_ids of the last connection or the session cache, or None
+        """
+        if self.session is not None:
+            return dict(self.session)
+        if self.session_cache is not None:
+            return self.session_cache.load()
+        return None
+
+    def store_session(self, headset_ids, auth_token, session_ids=None):
+        """
+        Function that keeps the token (and sessions) for a reconnect and writes them into the session cache
+        """
+        self.session = {"headset_ids": list(headset_ids), "auth_token": auth_token,
+                        "session_ids": list(session_ids) if session_ids else None}
+        if self.session_cache is not None:
+            self.session_cache.store(self.session["headset_ids"], auth_token, self.session["session_ids"])
+
+    def invalidate_session(self):
+        """
+        Function that drops a rejected token
+        """
+        self.session = None
+        if self.session_cache is not None:
+            self.session_cache.invalidate()
+
+    def on_samples(self, samples):
+        """
+        Function that tracks the stream of the current connection (sample rate, cortex time of the last sample)
+        :param samples: list of tuples (command, power, cortex time)
+        """
+        self.connection_samples += len(samples)
+        self.last_sample_time = samples[-1][2]
+        if self.connection_samples > 1 and self.last_sample_time > self.connection_first_time:
+            self.sample_rate = (self.connection_samples - 1) / (self.last_sample_time - self.connection_first_time)
+
+    def on_first_sample(self, cortex_time, resumed):
+        """
+        Function for the first sample of a connection: logs the time to first sample after the start or the time to
+        recover after a reconnect with an estimate of the samples lost in between
+        :param cortex_time: cortex time of the sample
+        :param resumed: boolean (token or session of an earlier connection / the cache were used)
+        """
+        now = time.perf_counter()
+        handshake = "cached" if resumed else "full"
+
+        if self.time_first_sample is None:
+            self.time_first_sample = now
+            logger.info("CortexClient - time to first sample: %.0f ms (%s handshake)",
+                        (now - self.time_started) * 1000.0, handshake)
+        elif self.time_disconnected is not None:
+            recover_time = now - self.time_disconnected
+            self.recover_times.append(recover_time)
+            lost = 0
+            if self.last_sample_time is not None and cortex_time > self.last_sample_time:
+                rate = self.sample_rate or self.nominal_sample_rate
+                # the first sample of the new connection is not lost
+                lost = max(0, int(round((cortex_time - self.last_sample_time) * rate)) - 1)
+            self.samples_lost += lost
+            logger.info("CortexClient - recovered after %.0f ms, ~%d samples lost (%s handshake)",
+                        recover_time * 1000.0, lost, handshake)
+        self.time_disconnected = None
+        self.connection_samples = 0
+        self.connection_first_time = cortex_time
+
+    def on_subscribed(self):
+        """
+        Function for a subscribed connection, the next reconnect starts again with the initial delay
+        """
+        self.resetDelay()
+
+    def clientConnectionLost(self, connector, reason):
+        """
+        Function that reconnects after a lost connection (twisted.internet.protocol.ClientFactory)
+        """
+        # stopTrying() -> the connection is closed at shutdown, no reconnect
+        if self.continueTrying and self.time_disconnected is None:
+            self.time_disconnected = time.perf_counter()
+            self.reconnects += 1
+            logger.warning("CortexClient - connection lost: %s", reason.getErrorMessage())
+        ReconnectingClientFactory.clientConnectionLost(self, connector, reason)
+
+    def clientConnectionFailed(self, connector, reason):
+        """
+        Function that retries a failed connection (Cortex not (yet) running)
+        """
+        ReconnectingClientFactory.clientConnectionFailed(self, connector, reason)
+        logger.info("CortexClient - connection failed, retry in %.1f s", self.delay)
+
+    def stats(self):
+        """
+        :return: dict with the reconnect metrics
+        """
+        stats = {"reconnects": self.reconnects, "samples_lost": self.samples_lost}
+        if self.recover_times:
+            stats["recover_ms_avg"] = round(1000.0 * sum(self.recover_times) / len(self.recover_times), 1)
+            stats["recover_ms_max"] = round(1000.0 * max(self.recover_times), 1)
+        return stats
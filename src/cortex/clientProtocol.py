@@ -1,12 +1,28 @@
 import json
 import logging
+import time
 
 from autobahn.twisted.websocket import WebSocketClientProtocol
+from twisted.internet import reactor
+
+from src.logPipeline import event_log
+
+# fastest available json backend for the data stream (all of them accept bytes)
+try:
+    import orjson as stream_json
+except ImportError:
+    try:
+        import ujson as stream_json
+    except ImportError:
+        stream_json = json
+
+logger = logging.getLogger(__name__)
 
 
 class CortexClientProtocol(WebSocketClientProtocol):
     """
-    Class for connection establishing and handling all requests and responses for cortex API
+    Class for connection establishing and handling all requests and responses for cortex API,
+    one connection serves all headsets (one session and one receiver per headset)
     """
     ID_QUERY_HEADSET = 1
     ID_CONTROL_DEVICE = 2
@@ -14,18 +30,37 @@ class CortexClientProtocol(WebSocketClientProtocol):
     ID_AUTHORIZE = 4
     ID_CREATE_SESSION = 5
     ID_SUBSCRIBE = 6
+    # requests of a single headset: id = step + index of the headset * HEADSET_ID_STRIDE
+    HEADSET_ID_STRIDE = 100
 
     is_subscribed = False
-    headset_id = None
+    first_sample_received = False
+    headset_ids = None
     auth_token = None
-    session_id = None
+    session_ids = None
+    # session id -> receiver (InputManager) of the headset
+    receivers_by_session = None
+    pending_devices = 0
+
+    # handshake shortcut with a cached token/session: None (full flow), "session" or "subscribe"
+    resume_stage = None
+
+    # subscribed messages: decode with the fastest json backend and hand them over once per reactor tick
+    streaming_fast_path = True
+    pending_samples = None
+    pending_signals = None
+    flush_scheduled = False
+
+    # stream name -> handler of its samples, all other subscribed streams use on_signal_sample
+    stream_handlers = {"com": "on_command_sample"}
+    dispatch = None
 
     @staticmethod
-    def log_client(msg):
+    def log_client(msg, *args):
         """
-        Function for Debug mode
+        Function for Debug mode, the message is formatted with the %-style arguments only if DEBUG is enabled
         """
-        logging.debug("CortexClient - {0}".format(msg))
+        logger.debug("CortexClient - " + msg, *args)
 
     def send_request(self, msg_id, method, params):
         """
@@ -41,7 +76,7 @@ class CortexClientProtocol(WebSocketClientProtocol):
             "params": params
         }
 
-        self.log_client("request: {0}".format(request))
+        self.log_client("request: %s", request)
         # twisted expects binary
         self.sendMessage(json.dumps(request).encode('utf8'))
 
@@ -50,7 +85,114 @@ class CortexClientProtocol(WebSocketClientProtocol):
         Function for first request
         """
         self.log_client("connection established")
-        self.send_request(self.ID_QUERY_HEADSET, "queryHeadsets", {})
+        self.receivers_by_session = {}
+        self.dispatch = {}
+
+        # token/sessions of the last connection (reconnect) or of the session cache (restart)
+        cached = self.factory.load_session()
+        if cached is None or len(cached["headset_ids"]) != len(self.factory.receivers):
+            self.send_request(self.ID_QUERY_HEADSET, "queryHeadsets", {})
+            return
+
+        self.headset_ids = cached["headset_ids"]
+        self.auth_token = cached["auth_token"]
+        if cached.get("session_ids"):
+            logger.info("CortexClient - resuming %d session(s)", len(self.headset_ids))
+            self.resume_stage = "subscribe"
+            self.session_ids = list(cached["session_ids"])
+            for index in range(len(self.headset_ids)):
+                self.send_subscribe(index)
+        else:
+            logger.info("CortexClient - creating session(s) with cached token")
+            self.resume_stage = "session"
+            self.session_ids = [None] * len(self.headset_ids)
+            for index in range(len(self.headset_ids)):
+                self.send_create_session(index)
+
+    def send_create_session(self, index):
+        """
+        Function for the createSession request
+        :param index: index of the headset
+        """
+        self.send_request(self.ID_CREATE_SESSION + index * self.HEADSET_ID_STRIDE, "createSession", {
+            "cortexToken": self.auth_token,
+            "headset": self.headset_ids[index],
+            "status": "active"
+        })
+
+    def send_subscribe(self, index):
+        """
+        Function for the subscribe request
+        :param index: index of the headset
+        """
+        self.send_request(self.ID_SUBSCRIBE + index * self.HEADSET_ID_STRIDE, "subscribe", {
+            "cortexToken": self.auth_token,
+            "session": self.session_ids[index],
+            "streams": list(self.factory.streams)
+        })
+
+    def on_headsets(self, headsets):
+        """
+        Function that connects one headset per receiver (players without headset keep the keyboard)
+        :param headsets: result of the queryHeadsets response
+        """
+        wanted = len(self.factory.receivers)
+        if not headsets:
+            logger.warning("CortexClient - no headset found, retry in 1 s")
+            reactor.callLater(1.0, self.send_request, self.ID_QUERY_HEADSET, "queryHeadsets", {})
+            return
+        if len(headsets) < wanted:
+            logger.warning("CortexClient - %d of %d headsets found", len(headsets), wanted)
+
+        self.headset_ids = [headset['id'] for headset in headsets[:wanted]]
+        self.session_ids = [None] * len(self.headset_ids)
+        self.pending_devices = len(self.headset_ids)
+        for index, headset_id in enumerate(self.headset_ids):
+            self.send_request(self.ID_CONTROL_DEVICE + index * self.HEADSET_ID_STRIDE, "controlDevice", {
+                "command": "connect",
+                "headset": headset_id
+            })
+
+    def on_subscribed(self, result, index):
+        """
+        Function that routes the session of a headset to its receiver, builds the dispatch table of the subscribed
+        streams and announces their columns and the headset to the receiver
+        :param result: result of the subscribe response
+        :param index: index of the headset
+        """
+        receiver = self.factory.receivers[index]
+        self.receivers_by_session[self.session_ids[index]] = receiver
+        self.is_subscribed = True
+
+        columns = {}
+        for stream in result["success"]:
+            name = stream["streamName"]
+            self.dispatch[name] = getattr(self, self.stream_handlers.get(name, "on_signal_sample"))
+            columns[name] = stream.get("cols", [])
+        for stream in result.get("failure", []):
+            logger.warning("CortexClient - stream %s not subscribed: %s",
+                           stream.get("streamName"), stream.get("message", stream.get("code")))
+        receiver.on_cortex_subscribed(columns, self.headset_ids[index])
+
+        if len(self.receivers_by_session) == len(self.headset_ids):
+            self.factory.store_session(self.headset_ids, self.auth_token, self.session_ids)
+            self.factory.on_subscribed()
+
+    def on_resume_rejected(self, response, step, index):
+        """
+        Function for a rejected cached session (-> new session with the cached token) or token (-> full flow)
+        :param response: error response
+        :param step: request step (ID_SUBSCRIBE or ID_CREATE_SESSION)
+        :param index: index of the headset
+        """
+        logger.info("CortexClient - cached %s rejected: %s",
+                    "session" if step == self.ID_SUBSCRIBE else "token", response.get("error"))
+        if step == self.ID_SUBSCRIBE:
+            self.send_create_session(index)
+        else:
+            self.resume_stage = None
+            self.factory.invalidate_session()
+            self.send_request(self.ID_QUERY_HEADSET, "queryHeadsets", {})
 
     def onMessage(self, payload, isBinary):
         """
@@ -62,71 +204,187 @@ class CortexClientProtocol(WebSocketClientProtocol):
         :param payload: current message
         :param isBinary: boolean for check
         """
+        if self.is_subscribed and self.streaming_fast_path:
+            self.on_stream_message(payload)
+            return
+
         decoded = payload.decode('utf8')
-        self.log_client("response: {0}".format(decoded))
+        self.log_client("response: %s", decoded)
         response = json.loads(decoded)
 
-        if not self.is_subscribed:
+        if "id" in response:
+            self.on_response(response)
+        elif self.is_subscribed:
+            # subscribed -> get data
+            receiver = self.receivers_by_session.get(response.get("sid"))
+            if receiver is None:
+                return
+            if "com" in response:
+                sample = (response["com"][0], response["com"][1], response.get("time", 0.0))
+                if not self.first_sample_received:
+                    self.first_sample_received = True
+                    self.factory.on_first_sample(sample[2], self.resume_stage is not None)
+                self.factory.on_samples([sample])
+                if self.factory.recorder is not None and receiver is self.factory.receiver:
+                    self.factory.recorder.record(*sample)
+                receiver.on_receive_cortex_data(response)
+                return
+            for name in self.dispatch:
+                if name in response:
+                    receiver.on_receive_cortex_stream(name, [(response.get("time", 0.0), response[name])])
 
-            if response["id"] == self.ID_QUERY_HEADSET:
-                # connection established -> response: try to connect
-                self.headset_id = response['result'][0]['id']
-                self.send_request(self.ID_CONTROL_DEVICE, "controlDevice", {
-                    "command": "connect",
-                    "headset": self.headset_id
-                })
+    def on_response(self, response):
+        """
+        Function for the responses of the handshake, every headset runs through controlDevice, createSession and
+        subscribe, the other steps are done once for all headsets
+        :param response: decoded response
+        """
+        index, step = divmod(response.get("id") or 0, self.HEADSET_ID_STRIDE)
+
+        if "error" in response:
+            if self.resume_stage is not None and step in (self.ID_SUBSCRIBE, self.ID_CREATE_SESSION):
+                self.on_resume_rejected(response, step, index)
+            else:
+                logger.error("CortexClient - request %s failed: %s", response.get("id"), response.get("error"))
+
+        elif step == self.ID_QUERY_HEADSET:
+            # connection established -> response: try to connect
+            self.on_headsets(response['result'])
 
-            elif response["id"] == self.ID_CONTROL_DEVICE:
-                # connected -> response: access
+        elif step == self.ID_CONTROL_DEVICE:
+            # all headsets connected -> response: access
+            self.pending_devices -= 1
+            if self.pending_devices == 0:
                 self.send_request(self.ID_REQUEST_ACCESS, "requestAccess", {
                     "clientId": self.factory.credentials['client_id'],
                     "clientSecret": self.factory.credentials['client_secret']
                 })
 
-            elif response["id"] == self.ID_REQUEST_ACCESS:
-                # accessed -> response: authorize
-                self.send_request(self.ID_AUTHORIZE, "authorize", {
-                    "clientId": self.factory.credentials['client_id'],
-                    "clientSecret": self.factory.credentials['client_secret'],
-                    "license": self.factory.credentials['license'],
-                    "debit": self.factory.credentials['debit']
-                })
+        elif step == self.ID_REQUEST_ACCESS:
+            # accessed -> response: authorize
+            self.send_request(self.ID_AUTHORIZE, "authorize", {
+                "clientId": self.factory.credentials['client_id'],
+                "clientSecret": self.factory.credentials['client_secret'],
+                "license": self.factory.credentials['license'],
+                "debit": self.factory.credentials['debit']
+            })
 
-            elif response["id"] == self.ID_AUTHORIZE:
-                # authorize -> response: create new session
-                self.auth_token = response['result']['cortexToken']
-                self.send_request(self.ID_CREATE_SESSION, "createSession", {
-                    "cortexToken": self.auth_token,
-                    "headset": self.headset_id,
-                    "status": "active"
-                })
+        elif step == self.ID_AUTHORIZE:
+            # authorize -> response: create new session for every headset
+            self.auth_token = response['result']['cortexToken']
+            self.factory.store_session(self.headset_ids, self.auth_token)
+            for index in range(len(self.headset_ids)):
+                self.send_create_session(index)
 
-            elif response["id"] == self.ID_CREATE_SESSION:
-                # created new session -> response: subscribe for "com" (mental commands)
-                self.session_id = response['result']['id']
-                self.send_request(self.ID_SUBSCRIBE, "subscribe", {
-                    "cortexToken": self.auth_token,
-                    "session": self.session_id,
-                    "streams": ['com']
-                })
+        elif step == self.ID_CREATE_SESSION:
+            # created new session -> response: subscribe for "com" (mental commands)
+            self.session_ids[index] = response['result']['id']
+            self.send_subscribe(index)
+
+        elif step == self.ID_SUBSCRIBE:
+            # subscribed -> check data
+            if len(response["result"]["success"]) > 0:
+                self.on_subscribed(response["result"], index)
+            elif self.resume_stage == "subscribe":
+                self.on_resume_rejected(response, step, index)
+            else:
+                # retry on failure
+                self.send_subscribe(index)
+
+    def on_stream_message(self, payload):
+        """
+        Fast path for subscribed data: json backend without utf8 decoding, no log formatting unless DEBUG is enabled,
+        the stream field selects the handler (dispatch table) and all samples of a reactor tick are passed to the
+        receivers with one call per session and stream
+        :param payload: current message
+        """
+        data = stream_json.loads(payload)
+        if logger.isEnabledFor(logging.DEBUG):
+            self.log_client("stream: %s", data)
 
-            elif response["id"] == self.ID_SUBSCRIBE:
-                # subscribed -> check data
-                if len(response["result"]["success"]) > 0:
-                    self.is_subscribed = True
-                else:
-                    # retry on failure
-                    self.send_request(self.ID_SUBSCRIBE, "subscribe", {
-                        "cortexToken": self.auth_token,
-                        "session": self.session_id,
-                        "streams": ['com']
-                    })
+        # every message carries the samples of one stream
+        for name, handler in self.dispatch.items():
+            values = data.get(name)
+            if values is not None:
+                if event_log.enabled:
+                    event_log.record(name, data.get("time", 0.0), values)
+                handler(data.get("sid"), name, values, data.get("time", 0.0))
+                break
         else:
-            # subscribed -> get data
-            self.factory.receiver.on_receive_cortex_data(response)
+            if "id" in data:
+                # response of a headset that is still in the handshake
+                self.on_response(data)
+            return
+
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            # runs after the reactor has handled all messages that are ready in this tick
+            reactor.callLater(0, self.flush_samples)
+
+    def on_command_sample(self, session_id, name, com, cortex_time):
+        """
+        Handler for the mental command stream
+        :param session_id: session of the headset
+        :param name: stream name ("com")
+        :param com: list [command, power]
+        :param cortex_time: time field of the message
+        """
+        if not self.first_sample_received:
+            self.first_sample_received = True
+            self.factory.on_first_sample(cortex_time, self.resume_stage is not None)
+        # the recording contains the mental commands of the first headset
+        if self.factory.recorder is not None and session_id == self.session_ids[0]:
+            self.factory.recorder.record(com[0], com[1], cortex_time)
+
+        if self.pending_samples is None:
+            self.pending_samples = {}
+        samples = self.pending_samples.get(session_id)
+        if samples is None:
+            samples = self.pending_samples[session_id] = []
+        # arrival time of the message for the latency of the input (src/inputLatency.py)
+        samples.append((com[0], com[1], cortex_time, time.monotonic()))
+
+    def on_signal_sample(self, session_id, name, values, cortex_time):
+        """
+        Handler for the data streams (eeg, pow, met, ...)
+        :param session_id: session of the headset
+        :param name: stream name
+        :param values: list of values (order of the cols of the subscribe response)
+        :param cortex_time: time field of the message
+        """
+        if self.pending_signals is None:
+            self.pending_signals = {}
+        key = (session_id, name)
+        samples = self.pending_signals.get(key)
+        if samples is None:
+            samples = self.pending_signals[key] = []
+        samples.append((cortex_time, values))
+
+    def flush_samples(self):
+        """
+        Function that passes the collected samples to the receiver of their session: mental commands
+        (command, power, cortex time, arrival time) and the data streams (cortex time, values)
+        """
+        commands = self.pending_samples
+        signals = self.pending_signals
+        self.pending_samples = None
+        self.pending_signals = None
+        self.flush_scheduled = False
+        if commands:
+            for session_id, samples in commands.items():
+                receiver = self.receivers_by_session.get(session_id)
+                if receiver is None:
+                    continue
+                self.factory.on_samples(samples)
+                receiver.on_receive_cortex_batch(samples)
+        if signals:
+            for (session_id, name), samples in signals.items():
+                receiver = self.receivers_by_session.get(session_id)
+                if receiver is not None:
+                    receiver.on_receive_cortex_stream(name, samples)
 
     def onClose(self, wasClean, code, reason):
         """
-        Function for debug mode (autobahn.websocket.interfaces.IWebSocketChannel.onClose)
+        Function for debug mode (autobahn.websocket.interfaces.IWebSocketChannel.onClose), the factory reconnects
         """
-        self.log_client("connection closed: {0}".format(reason))
+        self.log_client("connection closed: %s", reason)
@@ -0,0 +1,97 @@
+import mmap
+import os
+import struct
+import time
+
+# file header: magic, format version
+HEADER = struct.Struct("<6sH")
+MAGIC = b"FRCOM\x00"
+VERSION = 1
+# record: arrival time (seconds since the first sample), cortex time, command code, power
+RECORD = struct.Struct("<ddBf")
+
+# mental commands of the cortex "com" stream, the index is the command code in the file
+COMMANDS = (
+    "neutral", "left", "right", "push", "pull", "lift", "drop",
+    "rotateLeft", "rotateRight", "rotateClockwise", "rotateCounterClockwise",
+    "rotateForwards", "rotateReverse", "disappear"
+)
+
+
+class CommandRecorder:
+    """
+    Class that writes the received mental command samples into a compact binary file
+    """
+
+    def __init__(self, path):
+        """
+        Creates the file and writes the header
+        :param path: path of the recording
+        """
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.time_first_sample = None
+        self.count = 0
+
+    def record(self, command, power, cortex_time, arrival_time=None):
+        """
+        Function to write a single sample
+        :param command: command name
+        :param power: power of the command
+        :param cortex_time: time field of the cortex message
+        :param arrival_time: time.monotonic() when the message arrived (default: now)
+        """
+        if command not in COMMANDS:
+            return
+        if arrival_time is None:
+            arrival_time = time.monotonic()
+        if self.time_first_sample is None:
+            self.time_first_sample = arrival_time
+
+        self.file.write(RECORD.pack(arrival_time - self.time_first_sample, cortex_time or 0.0,
+                                    COMMANDS.index(command), power))
+        self.count += 1
+
+    def close(self):
+        """
+        Function that flushes and closes the file
+        """
+        self.file.close()
+
+
+class CommandRecording:
+    """
+    Class for reading a recording, the file is memory mapped and records are unpacked on access
+    """
+
+    def __init__(self, path):
+        """
+        Maps the file and checks the header
+        :param path: path of the recording
+        :raises ValueError: the file is too short or has no recording header
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise ValueError("{0} is not a mental command recording (truncated)".format(path))
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError("{0} is not a mental command recording".format(path))
+        self.count = (len(self.data) - HEADER.size) // RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """
+        :param index: record index
+        :return: tuple (arrival time, cortex time, command, power)
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        arrival_time, cortex_time, code, power = RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+        return arrival_time, cortex_time, COMMANDS[code], power
+
+    def close(self):
+        self.data.close()
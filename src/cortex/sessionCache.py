@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCache:
+    """
+    Class for the on-disk cache of the cortex token and the session, a restart can skip the handshake
+    up to createSession (cached token) or subscribe (cached session)
+    """
+
+    def __init__(self, path=".cortex_session.json", token_ttl=3600, session_ttl=600):
+        """
+        :param path: path of the cache file
+        :param token_ttl: seconds a cached cortex token is used
+        :param session_ttl: seconds a cached session is used
+        """
+        self.path = path
+        self.token_ttl = token_ttl
+        self.session_ttl = session_ttl
+
+    def load(self):
+        """
+        Function that reads the cache and drops expired entries
+        :return: dict with headset_ids, auth_token and session_ids (None if expired) or None
+        """
+        try:
+            with open(self.path) as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict):
+            return None
+
+        now = time.time()
+        headset_ids = entry.get("headset_ids")
+        if not isinstance(entry.get("auth_token"), str) or not entry["auth_token"] \
+                or not isinstance(headset_ids, list) or not headset_ids \
+                or not isinstance(entry.get("time_token"), (int, float)) \
+                or now - entry["time_token"] > self.token_ttl:
+            return None
+        session_ids = entry.get("session_ids")
+        # one session per headset, otherwise the sessions are created again
+        if not isinstance(session_ids, list) or len(session_ids) != len(headset_ids) \
+                or not isinstance(entry.get("time_session"), (int, float)) \
+                or now - entry["time_session"] > self.session_ttl:
+            entry["session_ids"] = None
+        return entry
+
+    def store(self, headset_ids, auth_token, session_ids=None):
+        """
+        Function that writes the current token (and sessions) into the cache
+        :param headset_ids: ids of the connected headsets
+        :param auth_token: cortex token
+        :param session_ids: ids of the active sessions (one per headset)
+        """
+        entry = self.load() or {}
+        now = time.time()
+        if entry.get("auth_token") != auth_token:
+            entry["time_token"] = now
+        entry.update({
+            "headset_ids": headset_ids,
+            "auth_token": auth_token,
+            "session_ids": session_ids,
+            "time_session": now if session_ids else 0
+        })
+        try:
+            # the token grants access to the cortex api -> readable by the owner only
+            descriptor = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            # the mode of os.open only applies to a new file
+            os.fchmod(descriptor, 0o600)
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(entry, file)
+        except OSError as error:
+            logger.warning("session cache not written: %s", error)
+
+    def invalidate(self):
+        """
+        Function that removes the cache (e.g. the cached token was rejected)
+        """
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
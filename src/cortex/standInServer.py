@@ -0,0 +1,314 @@
+"""
+Local stand-in for the Emotiv Cortex service: implements the JSON-RPC calls of CortexClientProtocol and streams
+synthetic "com" samples with a configurable rate, jitter and burst pattern. The data streams "eeg", "pow" and "met"
+are sent with their nominal rates and random values.
+
+    python -m src.cortex.standInServer --rate 8
+    python -m src.cortex.standInServer --rate 2000 --jitter 0.3 --burst-interval 2 --burst-hold 0.25
+"""
+import argparse
+import json
+import logging
+import random
+import time
+import uuid
+
+from autobahn.twisted.websocket import WebSocketServerFactory, WebSocketServerProtocol, listenWS
+from twisted.internet import reactor, task
+
+HEADSET_ID = "INSIGHT-STANDIN"
+
+EEG_CHANNELS = ["AF3", "F7", "F3", "FC5", "T7", "P7", "O1", "O2", "P8", "T8", "FC6", "F4", "F8", "AF4"]
+BANDS = ["theta", "alpha", "betaL", "betaH", "gamma"]
+# stream name -> (columns, samples per second)
+SIGNAL_STREAMS = {
+    "eeg": (["COUNTER", "INTERPOLATED"] + EEG_CHANNELS + ["RAW_CQ", "MARKER_HARDWARE", "MARKERS"], 128),
+    "pow": (["{0}/{1}".format(channel, band) for channel in EEG_CHANNELS for band in BANDS], 8),
+    "met": (["eng.isActive", "eng", "exc.isActive", "exc", "lex", "str.isActive", "str", "rel.isActive", "rel",
+             "int.isActive", "int", "foc.isActive", "foc"], 2)
+}
+
+
+class StandInError(Exception):
+    """
+    JSON-RPC error of a request
+    """
+
+    def __init__(self, code, message):
+        super(StandInError, self).__init__(message)
+        self.code = code
+        self.message = message
+
+
+class SampleStream:
+    """
+    Class that sends synthetic mental command samples to one client
+    """
+    commands = ["neutral", "left", "right"]
+
+    def __init__(self, protocol, session_id, factory):
+        """
+        :param protocol: StandInServerProtocol of the client
+        :param session_id: id of the subscribed session
+        :param factory: StandInServerFactory with the stream settings
+        """
+        self.protocol = protocol
+        self.session_id = session_id
+        self.factory = factory
+        self.random = random.Random(factory.seed)
+        self.sent = 0
+        self.time_start = None
+        self.next_tick = None
+
+    def start(self):
+        """
+        Function to start streaming
+        """
+        self.time_start = time.perf_counter()
+        self.next_tick = reactor.callLater(0, self.tick)
+
+    def stop(self):
+        """
+        Function to stop streaming
+        """
+        if self.next_tick is not None and self.next_tick.active():
+            self.next_tick.cancel()
+        self.next_tick = None
+
+    def tick(self):
+        """
+        Function that sends all samples due since the start (several samples per tick at high rates)
+        """
+        factory = self.factory
+        elapsed = time.perf_counter() - self.time_start
+
+        if factory.rate > 0:
+            due = int(elapsed * factory.rate)
+        else:
+            # as fast as possible
+            due = self.sent + factory.chunk_size
+        if factory.max_samples:
+            due = min(due, factory.max_samples)
+
+        # burst pattern: samples are held back and sent at once at the end of the hold time
+        holding = factory.burst_interval > 0 and (elapsed % factory.burst_interval) < factory.burst_hold
+        if not holding:
+            while self.sent < due:
+                self.send_sample()
+
+        if factory.max_samples and self.sent >= factory.max_samples:
+            self.next_tick = None
+            return
+
+        interval = max(1.0 / factory.rate, factory.min_tick) if factory.rate > 0 else 0
+        if factory.jitter:
+            interval *= 1.0 + self.random.uniform(-factory.jitter, factory.jitter)
+        self.next_tick = reactor.callLater(interval, self.tick)
+
+    def send_sample(self):
+        """
+        Function for a single "com" message
+        """
+        sample = {
+            "com": [self.random.choice(self.commands), round(self.random.random(), 3)],
+            "sid": self.session_id,
+            "time": time.time()
+        }
+        self.protocol.sendMessage(json.dumps(sample).encode('utf8'))
+        self.sent += 1
+
+
+class SignalStream:
+    """
+    Class that sends random samples of a data stream (eeg, pow, met) with the nominal rate of the stream
+    """
+    tick_interval = 0.01
+
+    def __init__(self, protocol, session_id, name, seed=None):
+        """
+        :param protocol: StandInServerProtocol of the client
+        :param session_id: id of the subscribed session
+        :param name: stream name (key of SIGNAL_STREAMS)
+        :param seed: seed for reproducible samples
+        """
+        self.protocol = protocol
+        self.session_id = session_id
+        self.name = name
+        self.columns, self.rate = SIGNAL_STREAMS[name]
+        self.random = random.Random(seed)
+        self.sent = 0
+        self.time_start = None
+        self.loop = task.LoopingCall(self.tick)
+
+    def start(self):
+        self.time_start = time.perf_counter()
+        self.loop.start(self.tick_interval)
+
+    def stop(self):
+        if self.loop.running:
+            self.loop.stop()
+
+    def tick(self):
+        due = int((time.perf_counter() - self.time_start) * self.rate)
+        while self.sent < due:
+            self.send_sample()
+
+    def send_sample(self):
+        values = []
+        for column in self.columns:
+            if column == "COUNTER":
+                values.append(self.sent % 128)
+            elif column == "MARKERS":
+                values.append([])
+            elif column.endswith("isActive"):
+                values.append(True)
+            else:
+                values.append(round(self.random.uniform(0.0, 100.0), 3))
+        sample = {self.name: values, "sid": self.session_id, "time": time.time()}
+        self.protocol.sendMessage(json.dumps(sample).encode('utf8'))
+        self.sent += 1
+
+
+class StandInServerProtocol(WebSocketServerProtocol):
+    """
+    Class that answers the JSON-RPC requests of one client
+    """
+    def onOpen(self):
+        self.streams = []
+        # streams of the last subscribe request, started after the response
+        self.new_streams = []
+
+    def onMessage(self, payload, isBinary):
+        """
+        Function that dispatches a request to the handler of its method
+        """
+        request = json.loads(payload.decode('utf8'))
+        handler = getattr(self, "on_" + request.get("method", ""), None)
+
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            if handler is None:
+                raise StandInError(-32601, "Method not found")
+            response["result"] = handler(request.get("params", {}))
+        except StandInError as error:
+            response["error"] = {"code": error.code, "message": error.message}
+        self.sendMessage(json.dumps(response).encode('utf8'))
+
+        if "result" in response and request.get("method") == "subscribe":
+            for stream in self.new_streams:
+                stream.start()
+            self.streams += self.new_streams
+            self.new_streams = []
+
+    def check_token(self, params):
+        """
+        Function that rejects requests with an unknown cortex token
+        """
+        if params.get("cortexToken") != self.factory.cortex_token:
+            raise StandInError(-32014, "Invalid cortex token")
+
+    def on_queryHeadsets(self, params):
+        return [{"id": headset_id, "status": "connected", "connectedBy": "dongle"}
+                for headset_id in self.factory.headset_ids]
+
+    def on_controlDevice(self, params):
+        if params.get("headset") not in self.factory.headset_ids:
+            raise StandInError(-32004, "Headset not found")
+        return {"command": params.get("command"),
+                "message": "Start connecting to device {0}".format(params.get("headset"))}
+
+    def on_requestAccess(self, params):
+        return {"accessGranted": True, "message": "The access right to the application has already been granted."}
+
+    def on_authorize(self, params):
+        return {"cortexToken": self.factory.cortex_token}
+
+    def on_createSession(self, params):
+        self.check_token(params)
+        if params.get("headset") not in self.factory.headset_ids:
+            raise StandInError(-32004, "Headset not found")
+        session_id = str(uuid.uuid4())
+        self.factory.sessions.add(session_id)
+        return {"id": session_id, "status": "activated", "headset": {"id": params.get("headset")}}
+
+    def on_subscribe(self, params):
+        self.check_token(params)
+        session_id = params.get("session")
+        streams = params.get("streams", [])
+        if session_id not in self.factory.sessions:
+            raise StandInError(-32005, "Session does not exist")
+
+        success = []
+        failure = []
+        for name in streams:
+            if name == "com":
+                self.new_streams.append(SampleStream(self, session_id, self.factory))
+                success.append({"streamName": name, "cols": ["act", "pow"], "sid": session_id})
+            elif name in SIGNAL_STREAMS:
+                self.new_streams.append(SignalStream(self, session_id, name, self.factory.seed))
+                success.append({"streamName": name, "cols": SIGNAL_STREAMS[name][0], "sid": session_id})
+            else:
+                failure.append({"streamName": name, "code": -32016, "message": "The stream is unavailable"})
+        return {"success": success, "failure": failure}
+
+    def onClose(self, wasClean, code, reason):
+        for stream in self.streams:
+            stream.stop()
+
+
+class StandInServerFactory(WebSocketServerFactory):
+    """
+    Class for the server factory with the stream settings
+    """
+    protocol = StandInServerProtocol
+    # shortest delay between two ticks, higher rates send several samples per tick
+    min_tick = 0.001
+    chunk_size = 500
+
+    def __init__(self, url, rate=8.0, jitter=0.0, burst_interval=0.0, burst_hold=0.0, max_samples=0, seed=None,
+                 headsets=1):
+        """
+        :param url: websocket url of the server
+        :param rate: samples per second (0 -> as fast as possible)
+        :param jitter: random deviation of the tick interval (0.2 -> +-20%)
+        :param burst_interval: seconds between two bursts (0 -> no bursts)
+        :param burst_hold: seconds the samples are held back before a burst
+        :param max_samples: stop streaming after this number of samples (0 -> no limit)
+        :param seed: seed for reproducible samples
+        """
+        WebSocketServerFactory.__init__(self, url)
+        self.rate = rate
+        self.jitter = jitter
+        self.burst_interval = burst_interval
+        self.burst_hold = burst_hold
+        self.max_samples = max_samples
+        self.seed = seed
+        self.cortex_token = str(uuid.uuid4())
+        self.sessions = set()
+        self.headset_ids = [HEADSET_ID] + ["{0}-{1}".format(HEADSET_ID, index + 1) for index in range(1, headsets)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Cortex stand-in server")
+    parser.add_argument("--port", type=int, default=6868)
+    parser.add_argument("--rate", type=float, default=8.0, help="samples per second (0 -> as fast as possible)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="relative jitter of the send interval")
+    parser.add_argument("--burst-interval", type=float, default=0.0, help="seconds between two bursts")
+    parser.add_argument("--burst-hold", type=float, default=0.0, help="seconds the samples are held before a burst")
+    parser.add_argument("--max-samples", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--headsets", type=int, default=1, help="number of connected headsets")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    url = "ws://127.0.0.1:{0}".format(args.port)
+    factory = StandInServerFactory(url, args.rate, args.jitter, args.burst_interval, args.burst_hold,
+                                   args.max_samples, args.seed, args.headsets)
+    listenWS(factory)
+    logging.info("cortex stand-in listening on %s", url)
+    reactor.run()
+
+
+if __name__ == "__main__":
+    main()
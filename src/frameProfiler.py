@@ -0,0 +1,176 @@
+import cProfile
+import csv
+import io
+import json
+import logging
+import pstats
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FrameProfiler:
+    """
+    Class that measures the time spent in every phase of the main game loop, keeps the phase times of the last
+    frames for percentiles (p50/p95/p99), exports them periodically and captures cProfile samples on request
+    """
+    phases = ("input", "update", "render", "present", "tick")
+    percentiles = (50, 95, 99)
+
+    def __init__(self, enabled=False, window=600):
+        """
+        :param enabled: disabled profilers only do an attribute check per phase
+        :param window: number of frames for the percentiles (rolling window)
+        """
+        self.enabled = enabled
+        self.totals = dict.fromkeys(self.phases, 0)
+        self.frames = 0
+        self.time_last_mark = 0
+
+        self.phase_index = {phase: index for index, phase in enumerate(self.phases)}
+        # phase times (ns) of the current frame and of the last frames, the last column is the whole frame
+        self.current = [0] * len(self.phases)
+        self.history = np.zeros((window, len(self.phases) + 1), dtype=np.int64)
+        self.history_index = 0
+        self.history_size = 0
+
+        # periodic export (csv or json lines)
+        self.export_path = None
+        self.export_interval = 10.0
+        self.time_last_export = None
+
+        # cProfile capture of a number of frames
+        self.capture = None
+        self.capture_frames_left = 0
+
+    def set_enabled(self, enabled):
+        """
+        Function to switch the profiler on or off during a frame (e.g. hotkey)
+        :param enabled: boolean
+        """
+        self.enabled = enabled
+        self.current = [0] * len(self.phases)
+        self.time_last_mark = time.perf_counter_ns()
+
+    def begin_frame(self):
+        """
+        Function to call at the start of a frame
+        """
+        if self.enabled:
+            self.time_last_mark = time.perf_counter_ns()
+
+    def mark(self, phase):
+        """
+        Function that adds the time since the last mark to a phase
+        :param phase: name of the finished phase
+        """
+        if self.enabled:
+            now = time.perf_counter_ns()
+            duration = now - self.time_last_mark
+            self.totals[phase] += duration
+            self.current[self.phase_index[phase]] += duration
+            self.time_last_mark = now
+
+    def end_frame(self):
+        """
+        Function to call after clock.tick() -> the remaining time is the tick phase
+        """
+        self.mark("tick")
+        self.frames += 1
+
+        if self.enabled:
+            row = self.history[self.history_index]
+            row[:-1] = self.current
+            row[-1] = sum(self.current)
+            self.current = [0] * len(self.phases)
+            self.history_index = (self.history_index + 1) % len(self.history)
+            self.history_size = min(self.history_size + 1, len(self.history))
+
+            if self.export_path is not None:
+                now = time.monotonic()
+                if self.time_last_export is None:
+                    self.time_last_export = now
+                elif now - self.time_last_export >= self.export_interval:
+                    self.time_last_export = now
+                    self.export()
+
+        if self.capture is not None:
+            self.capture_frames_left -= 1
+            if self.capture_frames_left <= 0:
+                self.stop_capture()
+
+    def frame_percentiles(self):
+        """
+        Function for the percentiles of the phase times over the rolling window
+        :return: dict phase (and "frame") -> list of milliseconds for the percentiles (p50, p95, p99)
+        """
+        if self.history_size == 0:
+            return {}
+        values = np.percentile(self.history[:self.history_size], self.percentiles, axis=0) / 1e6
+        names = self.phases + ("frame",)
+        return {name: values[:, index].tolist() for index, name in enumerate(names)}
+
+    def export(self):
+        """
+        Function that appends the current percentiles to the export file (.csv -> one row, else one json line)
+        """
+        snapshot = {"time": round(time.time(), 3), "frames": self.frames}
+        for name, values in self.frame_percentiles().items():
+            for percentile, value in zip(self.percentiles, values):
+                snapshot["{0}_p{1}".format(name, percentile)] = round(value, 3)
+        try:
+            if self.export_path.endswith(".csv"):
+                with open(self.export_path, "a", newline="") as file:
+                    writer = csv.DictWriter(file, fieldnames=list(snapshot))
+                    if file.tell() == 0:
+                        writer.writeheader()
+                    writer.writerow(snapshot)
+            else:
+                with open(self.export_path, "a") as file:
+                    file.write(json.dumps(snapshot) + "\n")
+        except OSError as error:
+            logger.warning("frame profile not exported: %s", error)
+
+    def start_capture(self, frames=120):
+        """
+        Function that profiles the next frames with cProfile (e.g. after a hotkey)
+        :param frames: number of profiled frames
+        """
+        if self.capture is not None:
+            return
+        logger.info("cProfile capture of %d frames started", frames)
+        self.capture_frames_left = frames
+        self.capture = cProfile.Profile()
+        self.capture.enable()
+
+    def stop_capture(self):
+        """
+        Function that ends the capture, writes the stats file and logs the most expensive functions
+        """
+        self.capture.disable()
+        path = time.strftime("frames-%Y%m%d-%H%M%S.prof")
+        self.capture.dump_stats(path)
+
+        text = io.StringIO()
+        pstats.Stats(self.capture, stream=text).sort_stats("cumulative").print_stats(15)
+        logger.info("cProfile capture written to %s\n%s", path, text.getvalue())
+        self.capture = None
+
+    def report(self, wall_time):
+        """
+        Function that creates the timing report
+        :param wall_time: seconds since the start of the measurement
+        :return: report text
+        """
+        frames = max(1, self.frames)
+        percentiles = self.frame_percentiles()
+        lines = ["{0} frames in {1:.2f} s -> {2:.1f} frames/s".format(self.frames, wall_time, self.frames / wall_time)]
+        for phase in self.phases:
+            total_ms = self.totals[phase] / 1e6
+            line = "  {0:<8} {1:10.1f} ms total {2:8.3f} ms/frame".format(phase, total_ms, total_ms / frames)
+            if phase in percentiles:
+                line += "   p50 {0:.3f}  p95 {1:.3f}  p99 {2:.3f} ms".format(*percentiles[phase])
+            lines.append(line)
+        return "\n".join(lines)
@@ -1,53 +1,44 @@
 import pygame
 
+from src.assetRegistry import assets
 
-class GameObject(pygame.sprite.Sprite):
+
+class GameObject:
     """
-    Class that defines and managed objects
+    Class that defines the objects (the positions of all falling objects are kept in the ObjectStore)
     """
-    images = [
-        pygame.image.load("img/apple.png"),
-        pygame.image.load("img/banana.png"),
-        pygame.image.load("img/grapes.png"),
-        pygame.image.load("img/lemon.png"),
-        pygame.image.load("img/orange.png"),
-        pygame.image.load("img/pineapple.png")
+    size = (96, 96)
+    # pixels per second (the same as the former 1px per frame at 60 fps)
+    fall_speed = 60.0
+    # objects start above the screen and are removed below this line
+    start_y = -100
+    bottom = 770
+    image_paths = [
+        "img/apple.png",
+        "img/banana.png",
+        "img/grapes.png",
+        "img/lemon.png",
+        "img/orange.png",
+        "img/pineapple.png"
     ]
 
-    def __init__(self, object_type, track_x):
+    @classmethod
+    def image_for(cls, object_type):
         """
-        Python method as a construct to initialize variables
-
+        Function that returns the (shared) image of an object type
         :param object_type: type of an object
-        :param track_x: defines the position of an object
-        """
-        super(GameObject, self).__init__()
-        self.object_type = object_type
-        self.surface = pygame.Surface((96, 96))
-        self.rect = self.surface.get_rect(
-            center=(
-                track_x,
-                -100
-            )
-        )
-
-    def is_at_bottom(self):
-        """
-        Function to check if object reached  bottom of the game screen
-        :return: boolean (reached or not)
-        """
-        return self.rect.bottom > 770
-
-    def update(self):
-        """
-        Defines the speed of an object
+        :return: pygame.Surface
         """
-        self.rect.move_ip(0, 1.5)
+        return assets.image(cls.image_paths[object_type - 1], alpha=True)
 
-    def render(self, surface):
+    @classmethod
+    def rect_at(cls, x, y):
         """
-        Render function for updating objects moves
-        :param surface: main game background
+        Function for the collision box of an object
+        :param x: x position (center)
+        :param y: y position (center)
+        :return: pygame.Rect
         """
-        img = self.images[self.object_type - 1]
-        surface.blit(img, self.rect)
+        rect = pygame.Rect((0, 0), cls.size)
+        rect.center = (round(x), round(y))
+        return rect
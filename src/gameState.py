@@ -1,9 +1,12 @@
-import pygame
 import logging
 import random
 
 from src.objectType import GameObjectType
 from src.input import Input
+from src.simulationClock import simulation_clock
+from src.streamingStats import RunningStats, P2Quantile
+
+logger = logging.getLogger(__name__)
 
 
 class GameState:
@@ -16,12 +19,21 @@ class GameState:
     expected_sequence = []
     min_signal_weight_left = 0.65
     min_signal_weight_right = 0.65
+    # threshold = this quantile of the signal powers collected while the player thinks of a direction
+    # (0.25 -> 75% of the calibration signals move the player, single spikes have no influence)
+    calibration_quantile = 0.25
+    # the threshold is 30% below the quantile -> always below the max. power (keyboard: 1.0 -> 0.7)
+    calibration_margin = 0.3
+    # direction -> tuple (RunningStats, P2Quantile) of the current calibration
+    calibration = None
+    # the thresholds were loaded from a stored calibration profile (user and headset)
+    profile_loaded = False
 
     def on_start_game(self):
         """
         Function to initialize variables for the start of the game
         """
-        self.time_game_started = pygame.time.get_ticks()
+        self.time_game_started = simulation_clock.get_ticks()
         self.penalties = 0
         self.matched_sequence = []
 
@@ -31,7 +43,7 @@ class GameState:
         :return: An array with objects in a sequence
         """
         self.expected_sequence = random.sample(list(GameObjectType), 3)
-        logging.info("expected_sequence: {0}".format(self.expected_sequence))
+        logger.info("expected_sequence: %s", self.expected_sequence)
         return self.expected_sequence
 
     def on_score_change(self, event):
@@ -44,21 +56,61 @@ class GameState:
 
     def reset_signal_weight(self):
         """
-        Reset weight of signals
+        Reset weight of signals and start a new calibration
         """
         self.min_signal_weight_left = 0.0
         self.min_signal_weight_right = 0.0
+        self.calibration = {direction: (RunningStats(), P2Quantile(self.calibration_quantile))
+                            for direction in (Input.LEFT, Input.RIGHT)}
 
     def update_signal_weight(self, input_event, direction):
         """
-        Function that specified the min. signal weight for playing the game
+        Function that specified the min. signal weight for playing the game: the signal powers of the direction are
+        fed into streaming statistics, the threshold is their calibration quantile less the calibration margin
         :param input_event: received signal
         :param direction: signal input direction
         """
-        if input_event:
-            # use 30% less than maximum
-            weight = input_event[1] - (input_event[1] * 0.3)
-            if input_event[0] == Input.LEFT and direction == Input.LEFT and weight > self.min_signal_weight_left:
-                self.min_signal_weight_left = weight
-            if input_event[0] == Input.RIGHT and direction == Input.RIGHT and weight > self.min_signal_weight_right:
-                self.min_signal_weight_right = weight
+        if not input_event or input_event[0] != direction or self.calibration is None:
+            return
+        stats, quantile = self.calibration[direction]
+        stats.add(input_event[1])
+        quantile.add(input_event[1])
+        threshold = min(quantile.value(), stats.max) * (1.0 - self.calibration_margin)
+        if direction == Input.LEFT:
+            self.min_signal_weight_left = threshold
+        elif direction == Input.RIGHT:
+            self.min_signal_weight_right = threshold
+
+    def calibration_profile(self):
+        """
+        :return: dict with the thresholds "left" and "right" and the calibration summary (for CalibrationProfiles)
+        """
+        return {
+            "left": self.min_signal_weight_left,
+            "right": self.min_signal_weight_right,
+            "summary": self.calibration_summary()
+        }
+
+    def apply_calibration_profile(self, profile):
+        """
+        Function that sets the thresholds of a stored calibration profile
+        :param profile: dict with the thresholds "left" and "right"
+        """
+        self.min_signal_weight_left = profile["left"]
+        self.min_signal_weight_right = profile["right"]
+        self.profile_loaded = True
+
+    def calibration_summary(self):
+        """
+        :return: dict direction name -> count, mean, std, max and threshold of the calibration signals
+        """
+        if self.calibration is None:
+            return {}
+        return {direction.name: {
+            "count": stats.count,
+            "mean": round(stats.mean, 3),
+            "std": round(stats.std, 3),
+            "max": round(stats.max, 3) if stats.count else None,
+            "threshold": round(min(quantile.value(), stats.max) * (1.0 - self.calibration_margin), 3)
+            if stats.count else None
+        } for direction, (stats, quantile) in self.calibration.items()}
@@ -0,0 +1,110 @@
+import threading
+import time
+from array import array
+
+
+class InputRingBuffer:
+    """
+    Fixed capacity, array backed and thread safe ring buffer for mental command samples
+    (arrival time, cortex time, command, power)
+    """
+
+    def __init__(self, capacity=256, max_age=1.0):
+        """
+        Preallocates the arrays
+        :param capacity: max number of buffered samples, the oldest sample is overwritten when the buffer is full
+        :param max_age: samples older than max_age seconds (by arrival time) are dropped as stale
+        """
+        self.capacity = capacity
+        self.max_age = max_age
+
+        self.arrival_times = array('d', [0.0]) * capacity
+        self.cortex_times = array('d', [0.0]) * capacity
+        self.commands = array('b', [0]) * capacity
+        self.powers = array('d', [0.0]) * capacity
+        # command name <-> code (index)
+        self.command_names = []
+
+        self.head = 0
+        self.size = 0
+        self.lock = threading.Lock()
+
+        self.overflow_count = 0
+        self.stale_count = 0
+
+    def push(self, command, power, cortex_time=0.0, arrival_time=None):
+        """
+        Function to add a new sample (called from the reactor thread)
+        :param command: command name ("left", "right", "neutral", ...)
+        :param power: power of the command
+        :param cortex_time: time field of the cortex message
+        :param arrival_time: time.monotonic() when the message arrived (default: now)
+        """
+        self.push_many([(command, power, cortex_time)], arrival_time)
+
+    def push_many(self, samples, arrival_time=None):
+        """
+        Function to add several samples with one lock acquisition
+        :param samples: list of tuples (command, power, cortex time) or (command, power, cortex time, arrival time)
+        :param arrival_time: time.monotonic() when the samples without own arrival time arrived (default: now)
+        """
+        if arrival_time is None:
+            arrival_time = time.monotonic()
+
+        with self.lock:
+            for sample in samples:
+                command = sample[0]
+                if command not in self.command_names:
+                    self.command_names.append(command)
+                index = self.head
+                self.arrival_times[index] = sample[3] if len(sample) > 3 else arrival_time
+                self.cortex_times[index] = sample[2]
+                self.commands[index] = self.command_names.index(command)
+                self.powers[index] = sample[1]
+
+                self.head = (index + 1) % self.capacity
+                if self.size == self.capacity:
+                    self.overflow_count += 1
+                else:
+                    self.size += 1
+
+    def drain(self, now=None):
+        """
+        Function that takes all buffered samples (oldest first) and drops the stale ones
+        :param now: time.monotonic() of the drain (default: now)
+        :return: list of tuples (arrival time, cortex time, command, power)
+        """
+        if now is None:
+            now = time.monotonic()
+        oldest_allowed = now - self.max_age
+
+        samples = []
+        with self.lock:
+            start = (self.head - self.size) % self.capacity
+            for i in range(self.size):
+                index = (start + i) % self.capacity
+                if self.arrival_times[index] < oldest_allowed:
+                    self.stale_count += 1
+                    continue
+                samples.append((
+                    self.arrival_times[index],
+                    self.cortex_times[index],
+                    self.command_names[self.commands[index]],
+                    self.powers[index]
+                ))
+            self.size = 0
+        return samples
+
+    def __len__(self):
+        return self.size
+
+    def stats(self):
+        """
+        Function for the buffer counters
+        :return: dict with buffered, overflow and stale sample counts
+        """
+        return {
+            "buffered": self.size,
+            "overflow": self.overflow_count,
+            "stale": self.stale_count
+        }
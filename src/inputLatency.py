@@ -0,0 +1,135 @@
+import logging
+import time
+
+from src.streamingStats import RunningStats, P2Quantile
+
+logger = logging.getLogger(__name__)
+
+
+class InputTrace:
+    """
+    Timestamps (time.monotonic()) of one mental command on its way from the cortex message to the screen
+    """
+    __slots__ = ("cortex_time", "arrival", "computed", "moved")
+
+    def __init__(self, cortex_time, arrival, computed):
+        self.cortex_time = cortex_time
+        self.arrival = arrival
+        self.computed = computed
+        self.moved = None
+
+    def __repr__(self):
+        return "InputTrace(arrival={0:.3f}, computed={1:.3f})".format(self.arrival, self.computed)
+
+
+class StageStats:
+    """
+    Streaming distribution (count, mean, p50, p95, p99) of the latency of one stage in milliseconds
+    """
+    quantiles = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.estimates = [P2Quantile(p) for p in self.quantiles]
+
+    def add(self, milliseconds):
+        self.stats.add(milliseconds)
+        for estimate in self.estimates:
+            estimate.add(milliseconds)
+
+    def summary(self):
+        """
+        :return: dict with count, mean, p50, p95, p99 and max
+        """
+        if self.stats.count == 0:
+            return {"count": 0}
+        summary = {"count": self.stats.count, "mean": round(self.stats.mean, 1)}
+        for p, estimate in zip(self.quantiles, self.estimates):
+            summary["p{0:g}".format(p * 100)] = round(estimate.value(), 1)
+        summary["max"] = round(self.stats.max, 1)
+        return summary
+
+
+class LatencyTracer:
+    """
+    Class that measures the latency of the mental commands per stage:
+    transport (cortex time -> onMessage), gate (onMessage -> compute_cortex_event, 300 ms polling),
+    frame (compute -> move of the cart in the next simulation step), present (move -> display update)
+    and total (onMessage -> display update), commands dropped by the cooldown of the player are counted
+    with their remaining cooldown
+    """
+    stages = ("transport", "gate", "frame", "present", "total")
+
+    def __init__(self):
+        # the cortex time is a unix time, arrival times are monotonic
+        self.wall_offset = time.time() - time.monotonic()
+        self.stage_stats = {stage: StageStats() for stage in self.stages}
+        self.cooldown_wait = StageStats()
+        self.below_threshold = 0
+        # traces moved since the last display update
+        self.moved = []
+
+    def on_computed(self, cortex_time, arrival):
+        """
+        Function for a computed input event
+        :param cortex_time: time field of the chosen sample (0 -> unknown)
+        :param arrival: time.monotonic() when the sample arrived
+        :return: InputTrace
+        """
+        now = time.monotonic()
+        if cortex_time:
+            self.stage_stats["transport"].add((arrival + self.wall_offset - cortex_time) * 1000.0)
+        self.stage_stats["gate"].add((now - arrival) * 1000.0)
+        return InputTrace(cortex_time, arrival, now)
+
+    def on_moved(self, trace):
+        """
+        Function for an input event that moved the cart (rect.move_ip)
+        """
+        trace.moved = time.monotonic()
+        self.stage_stats["frame"].add((trace.moved - trace.computed) * 1000.0)
+        self.moved.append(trace)
+
+    def on_cooldown(self, trace, remaining_ms):
+        """
+        Function for an input event that is dropped because the cart moved less than a second ago
+        :param remaining_ms: remaining cooldown of the player
+        """
+        self.cooldown_wait.add(remaining_ms)
+
+    def on_below_threshold(self, trace):
+        """
+        Function for an input event that is weaker than the calibrated threshold
+        """
+        self.below_threshold += 1
+
+    def on_present(self):
+        """
+        Function to call after the display update, the moves of the frame are visible
+        """
+        if not self.moved:
+            return
+        now = time.monotonic()
+        for trace in self.moved:
+            self.stage_stats["present"].add((now - trace.moved) * 1000.0)
+            self.stage_stats["total"].add((now - trace.arrival) * 1000.0)
+        self.moved = []
+
+    def summary(self):
+        """
+        :return: dict stage -> distribution, and the dropped input events
+        """
+        summary = {stage: self.stage_stats[stage].summary() for stage in self.stages}
+        summary["dropped_by_cooldown"] = self.cooldown_wait.summary()
+        summary["below_threshold"] = self.below_threshold
+        return summary
+
+    def report(self):
+        """
+        Logs the latency distribution of every stage in milliseconds
+        """
+        for stage, summary in self.summary().items():
+            logger.info("input latency %s: %s", stage, summary)
+
+
+latency_tracer = LatencyTracer()
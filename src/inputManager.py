@@ -1,84 +1,187 @@
-from src.cortex.client import CortexClient
+from src.cortex.sessionCache import SessionCache
 from user_credentials import UserCredentials
 from src.input import Input
+from src.inputBuffer import InputRingBuffer
+from src.inputLatency import latency_tracer
+from src.signalBuffer import SignalRingBuffer
 
 import pygame
 import logging
 
+logger = logging.getLogger(__name__)
+
 
 class InputManager:
     """
     Class to deal with any game inputs (keyboard or BCI)
     """
-    queued_inputs = []
     cortex_connection = None
     cortex_command_min_weight = 0.1
     cortex_compute_interval = 300
     cortex_time_last_compute = 0
+    # samples older than this (seconds) are ignored, e.g. after a stalled game loop
+    cortex_max_input_age = 1.0
+    cortex_buffer_capacity = 256
+    # subscribed data streams, "com" controls the player, the samples of the others are kept in NumPy ring buffers
+    cortex_streams = ("com",)
+    # seconds of the data streams in the ring buffers and samples per second of each stream
+    cortex_signal_seconds = 4
+    cortex_stream_rates = {"eeg": 256, "pow": 8, "met": 2, "mot": 64, "dev": 2}
 
+    # local stand-in server (src/cortex/standInServer.py) instead of the Emotiv service
     use_test_server = False
+    test_server_url = "ws://127.0.0.1:6868"
+
+    def __init__(self, input_source=None, keys=(pygame.K_LEFT, pygame.K_RIGHT)):
+        """
+        Initializes the input buffer, cortex data can be received from the reactor thread (thread mode)
+        :param input_source: optional source (e.g. SyntheticInputSource) that is used instead of the cortex API
+        :param keys: keyboard keys (left, right) of the player
+        """
+        self.keys = keys
+        self.input_buffer = InputRingBuffer(self.cortex_buffer_capacity, self.cortex_max_input_age)
+        self.input_source = input_source
+        # optional CommandRecorder for the cortex data
+        self.recorder = None
+        self.session_cache = SessionCache()
+        # stream name -> SignalRingBuffer, created when the streams are subscribed
+        self.signal_buffers = {}
+        # id of the headset of this player (known after the subscription, key of the calibration profile)
+        self.headset_id = None
+        # clock of the compute interval (the headless mode uses the simulation clock)
+        self.get_ticks = pygame.time.get_ticks
 
-    def init(self):
+    def init(self, receivers=None):
         """
         Function to initialize the connection to cortex API
+        :param receivers: InputManagers of all players (one headset each) that share the connection,
+                          default: only this one
+        """
+        if self.input_source is not None:
+            return
+        # twisted and autobahn are only loaded for a cortex connection
+        from src.cortex.client import CortexClient
+
+        if receivers is None:
+            receivers = [self]
+        if self.use_test_server:
+            self.cortex_connection = CortexClient(UserCredentials.credentials, receivers, self.test_server_url,
+                                                  recorder=self.recorder, session_cache=self.session_cache,
+                                                  streams=self.cortex_streams)
+        else:
+            self.cortex_connection = CortexClient(UserCredentials.credentials, receivers, recorder=self.recorder,
+                                                  session_cache=self.session_cache, streams=self.cortex_streams)
+
+    def stop(self):
+        """
+        Function to call before the reactor stops, ends the reconnects of the cortex connection
+        """
+        if self.cortex_connection is not None:
+            self.cortex_connection.stop()
+
+    def on_cortex_subscribed(self, columns, headset_id=None):
+        """
+        Function that preallocates a ring buffer for every subscribed data stream (kept after a reconnect)
+        :param columns: dict stream name -> column names
+        :param headset_id: id of the headset of the session
         """
-        self.cortex_connection = CortexClient(UserCredentials.credentials, self)
+        self.headset_id = headset_id
+        for name, stream_columns in columns.items():
+            if name == "com":
+                continue
+            buffer = self.signal_buffers.get(name)
+            if buffer is None or buffer.source_columns != list(stream_columns):
+                capacity = self.cortex_stream_rates.get(name, 128) * self.cortex_signal_seconds
+                self.signal_buffers[name] = SignalRingBuffer(stream_columns, capacity)
 
     def on_receive_cortex_data(self, data):
         """
         Function for putting new received date from cortex in to the queue
         :param data: input message
         """
-        logging.debug("received cortex data: " + str(data))
-        self.queued_inputs.append(data["com"])
+        logger.debug("received cortex data: %s", data)
+        command, power = data["com"]
+        self.input_buffer.push(command, power, data.get("time", 0.0))
+
+    def on_receive_cortex_batch(self, samples):
+        """
+        Function for putting all samples received in one reactor tick in to the queue
+        :param samples: list of tuples (command, power, cortex time[, arrival time])
+        """
+        self.input_buffer.push_many(samples)
+
+    def on_receive_cortex_stream(self, name, samples):
+        """
+        Function for putting the samples of a data stream received in one reactor tick in to its ring buffer
+        :param name: stream name ("eeg", "pow", ...)
+        :param samples: list of tuples (cortex time, list of values)
+        """
+        buffer = self.signal_buffers.get(name)
+        if buffer is not None:
+            buffer.push_many(samples)
 
     def compute_cortex_event(self):
         """
         Function that helps dealing with input from cortex API by taking data from the queue and split the input into
         the power(weight) of the signal and the player move
-        :return: tuple of the move and the weight of the signal
+        :return: tuple of the move, the weight of the signal and the InputTrace of the chosen sample
         """
-        time_passed = pygame.time.get_ticks() - self.cortex_time_last_compute
+        time_passed = self.get_ticks() - self.cortex_time_last_compute
 
         if time_passed < self.cortex_compute_interval:
             return None
 
-        self.cortex_time_last_compute = pygame.time.get_ticks()
+        self.cortex_time_last_compute = self.get_ticks()
+
+        logger.debug("computing cortex event")
 
-        logging.debug("computing cortex event")
+        # all fresh samples at once, the reactor thread continues with an empty buffer
+        queued_inputs = self.input_buffer.drain()
 
-        if len(self.queued_inputs) > 0:
-            best_match = [None, 0]
+        if len(queued_inputs) > 0:
+            best_match = [None, 0, 0.0, 0.0]
 
-            while len(self.queued_inputs) > 0:
-                data = self.queued_inputs.pop()
-                command, weight = data
+            while len(queued_inputs) > 0:
+                arrival_time, cortex_time, command, weight = queued_inputs.pop()
                 if weight > best_match[1]:
-                    best_match = data
+                    best_match = [command, weight, cortex_time, arrival_time]
             if best_match[1] >= self.cortex_command_min_weight:
                 command = best_match[0]
                 if command == "left":
-                    return Input.LEFT, best_match[1]
+                    return Input.LEFT, best_match[1], latency_tracer.on_computed(best_match[2], best_match[3])
                 elif command == "right":
-                    return Input.RIGHT, best_match[1]
+                    return Input.RIGHT, best_match[1], latency_tracer.on_computed(best_match[2], best_match[3])
         return None
 
     def on_loop(self, events):
         """
         Function for updating moves of a player
         :param events: pygame.event.get()
-        :return: tuple of the move and the weight of the signal (for keyboard power of the signal 100%)
+        :return: tuple of the move and the weight of the signal (for keyboard power of the signal 100%),
+                 cortex events have the InputTrace as third element
         """
         # Cortex data input
+        if self.input_source is not None:
+            self.input_source.poll(self)
         event = self.compute_cortex_event()
         if event:
-            logging.debug("computed cortex event: {0}".format(event))
+            logger.debug("computed cortex event: %s", event)
             return event
 
         # Keyboard input (ignored if cortex data input exists )
         for event in events:
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT:
+            if event.type == pygame.KEYDOWN and event.key == self.keys[1]:
                 return Input.RIGHT, 1.0
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT:
+            elif event.type == pygame.KEYDOWN and event.key == self.keys[0]:
                 return Input.LEFT, 1.0
         return None
+
+    def report(self):
+        """
+        Logs the input buffer counters and the reconnect metrics of the cortex connection
+        """
+        logger.info("input buffer: %s", self.input_buffer.stats())
+        if self.cortex_connection is not None:
+            logger.info("cortex connection: %s", self.cortex_connection.stats())
+        for name, buffer in self.signal_buffers.items():
+            logger.info("%s stream: %s", name, buffer.stats())
@@ -0,0 +1,164 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import struct
+import threading
+
+from src.cortex.commandRecording import COMMANDS
+
+# binary event log: file header (magic, format version) and record header (stream code, cortex time, value count)
+# followed by the values as float32
+EVENT_HEADER = struct.Struct("<6sH")
+EVENT_MAGIC = b"FREVT\x00"
+EVENT_VERSION = 1
+EVENT_RECORD = struct.Struct("<BdH")
+
+# cortex streams, the index is the stream code in the file
+EVENT_STREAMS = ("com", "eeg", "pow", "met", "mot", "dev", "fac", "sys")
+NAN = float("nan")
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that passes the record unformatted: the message is built from the %-style arguments in the
+    listener thread (the arguments must not be changed after the call)
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=logging.DEBUG, levels=None, use_queue=True):
+    """
+    Function that configures the root logger: all records go through a queue to a background thread that formats
+    and writes them to stderr, the game loop and the reactor only create the record
+    :param level: level of the root logger
+    :param levels: dict logger name (e.g. "src.cortex", "src.objectManager") -> level of the subsystem
+    :param use_queue: False -> format and write in the calling thread (logging.basicConfig)
+    :return: QueueListener (stopped at exit) or None
+    """
+    root = logging.getLogger()
+    root.setLevel(level)
+    for name, subsystem_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(subsystem_level)
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    if not use_queue:
+        root.addHandler(handler)
+        return None
+
+    records = queue.SimpleQueue()
+    root.addHandler(DeferredQueueHandler(records))
+    listener = logging.handlers.QueueListener(records, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def parse_levels(text):
+    """
+    Function for the per subsystem levels of the command line
+    :param text: comma separated name=LEVEL pairs, e.g. "src.cortex=INFO,src.objectManager=WARNING"
+    :return: dict logger name -> level
+    """
+    levels = {}
+    for pair in text.split(","):
+        if not pair:
+            continue
+        name, _, level = pair.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class BinaryEventLog:
+    """
+    Class that writes the samples of high-rate cortex streams into a compact binary file instead of the text log,
+    the samples are packed and written by a background thread
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.file = None
+        self.samples = None
+        self.writer = None
+        self.count = 0
+
+    def open(self, path):
+        """
+        Function that creates the file and starts the writer thread
+        :param path: path of the event log
+        """
+        self.file = open(path, "wb")
+        self.file.write(EVENT_HEADER.pack(EVENT_MAGIC, EVENT_VERSION))
+        self.samples = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self.write_samples, name="event-log", daemon=True)
+        self.writer.start()
+        self.enabled = True
+        atexit.register(self.close)
+
+    def record(self, stream, cortex_time, values):
+        """
+        Function to log a sample (called from the reactor thread, does not block)
+        :param stream: stream name ("com", "eeg", ...)
+        :param cortex_time: time field of the message
+        :param values: list of values of the sample ("com": [command, power])
+        """
+        if self.enabled:
+            self.samples.put((stream, cortex_time, values))
+
+    def write_samples(self):
+        """
+        Writer thread: packs the queued samples until close() puts None
+        """
+        while True:
+            sample = self.samples.get()
+            if sample is None:
+                break
+            stream, cortex_time, values = sample
+            if stream not in EVENT_STREAMS:
+                continue
+            if stream == "com":
+                values = (COMMANDS.index(values[0]) if values[0] in COMMANDS else 255, values[1])
+            else:
+                # one value per column: NaN for missing, text and nested values (markers, expressions, contact
+                # quality) -> the values can still be mapped to the cols of the stream
+                values = [value if isinstance(value, (int, float)) else NAN for value in values]
+            self.file.write(EVENT_RECORD.pack(EVENT_STREAMS.index(stream), cortex_time or 0.0, len(values)))
+            self.file.write(struct.pack("<{0}f".format(len(values)), *values))
+            self.count += 1
+
+    def close(self):
+        """
+        Function that writes the remaining samples and closes the file
+        """
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.samples.put(None)
+        self.writer.join()
+        self.file.close()
+
+
+def read_events(path):
+    """
+    Generator for the samples of an event log
+    :param path: path of the event log
+    :return: tuples (stream name, cortex time, tuple of values), one value per column (NaN -> not numeric)
+    """
+    with open(path, "rb") as file:
+        magic, version = EVENT_HEADER.unpack(file.read(EVENT_HEADER.size))
+        if magic != EVENT_MAGIC or version != EVENT_VERSION:
+            raise ValueError("{0} is not an event log".format(path))
+        while True:
+            header = file.read(EVENT_RECORD.size)
+            if len(header) < EVENT_RECORD.size:
+                return
+            code, cortex_time, count = EVENT_RECORD.unpack(header)
+            values = struct.unpack("<{0}f".format(count), file.read(4 * count))
+            yield EVENT_STREAMS[code], cortex_time, values
+
+
+# shared by the cortex protocol and main()
+event_log = BinaryEventLog()
@@ -1,3 +1,11 @@
+# first import -> the startup timer includes the import of all game modules
+from src.startupTimer import startup_timer
+
+import argparse
+import functools
+import os
+import threading
+import time
 import pygame
 import logging
 
@@ -5,139 +13,610 @@ from src.screen.inputIndicator import InputIndicator
 from src.objectManager import GameObjectManager
 from src.screen.mainScreen import GameScreen
 from src.gameState import GameState
-from twisted.internet import reactor
-from twisted.internet.task import Cooperator
+from src.gameObject import GameObject
 from src.player import Player
 
 from src.inputManager import InputManager
 from src.screen.menuScreen import MenuScreen
+from src.calibrationProfiles import CalibrationProfiles
 from src.screen.scoreIndicator import ScoreIndicator
+from src.screen.dirtyRenderer import DirtyRectRenderer
+from src.screen.profilerOverlay import ProfilerOverlay
+from src.screen.textCache import text_cache
+from src.assetRegistry import assets
+from src.soundBank import sounds, SoundBank
+from src.frameProfiler import FrameProfiler
+from src.inputLatency import latency_tracer
+from src.logPipeline import setup_logging, parse_levels, event_log
+from src.telemetry import telemetry
+from src.syntheticInput import SyntheticInputSource
+from src.replayInput import ReplayInputSource
+from src.cortex.commandRecording import CommandRecorder, CommandRecording
+from src.simulationClock import simulation_clock
+
+# explicit name, the module is __main__ when the game is started as a script
+logger = logging.getLogger("src.mainGameLoop")
 
 START_GAME_EVENT = pygame.USEREVENT + 1
 END_GAME_EVENT = pygame.USEREVENT + 2
 SCORE_CHANGE_EVENT = pygame.USEREVENT + 3
+CALIBRATION_DONE_EVENT = pygame.USEREVENT + 4
 
-BLACK = (0, 0, 0)
+# execution modes of the game loop
+LOOP_COOPERATOR = "cooperator"
+LOOP_TIMER = "timer"
+LOOP_THREAD = "thread"
+
+# multiplayer: all players catch the same objects (versus) or every player has own lanes (split)
+MODE_VERSUS = "versus"
+MODE_SPLIT = "split"
+# keyboard keys (left, right) of the players
+PLAYER_KEYS = [(pygame.K_LEFT, pygame.K_RIGHT), (pygame.K_a, pygame.K_d), (pygame.K_j, pygame.K_l),
+               (pygame.K_KP4, pygame.K_KP6)]
+# hotkeys: frame phase percentiles on screen, cProfile capture of the next frames
+PROFILER_OVERLAY_KEY = pygame.K_F3
+PROFILER_CAPTURE_KEY = pygame.K_F4
+
+# twisted (reactor) and autobahn are imported when the loop mode needs them -> the headless mode never loads them
 
 
 class Game:
     # properties
     running = False
     fps = 60
-
-    def __init__(self):
+    # only push changed regions to the display while a game is running
+    dirty_rendering = False
+    music = True
+    # start a new game right after the end of a game (headless mode)
+    skip_menu = False
+    # frame phase percentiles next to the input indicator (toggled with F3)
+    show_profiler = False
+    # CalibrationProfiles of the returning players (None -> every session is calibrated)
+    calibration_profiles = None
+    # calibrate even if profiles of all players exist (the new results replace the profiles)
+    recalibrate = False
+    # images decoded in a thread pool while the window is created: tuples (path, alpha)
+    preload_images = [("img/menu1.png", False), ("img/menu_focus.png", False), ("img/menu2.png", False),
+                      ("img/menu3.png", False), ("img/game_status.png", False), ("img/background.png", False),
+                      ("img/Shopping_Cart.png", True)] + [(path, True) for path in GameObject.image_paths]
+
+    def __init__(self, input_source=None, players=1, mode=MODE_VERSUS):
         """
         Instances InputManager class and sets up the game clock
+        :param input_source: optional input source instead of the cortex API (first player)
+        :param players: number of players, one headset (or keyboard keys) and one input manager each
+        :param mode: MODE_VERSUS or MODE_SPLIT
         """
-        self.input_manager = InputManager()
+        self.player_count = players
+        self.mode = mode
+        self.input_managers = [InputManager(input_source if index == 0 else None, PLAYER_KEYS[index])
+                               for index in range(players)]
+        # the first input manager opens the cortex connection for all players
+        self.input_manager = self.input_managers[0]
         # for fps and to calculate how long does the game is running
         self.clock = pygame.time.Clock()
-
-    def start(self):
+        self.frame_loop = None
+        self.profiler = FrameProfiler()
+        self.games_played = 0
+        # input of the frame (per player) that is not handled by a simulation step yet
+        self.pending_inputs = [None] * players
+        # user names of the players (key of the calibration profiles together with the headset)
+        self.users = ["default"] * players
+        # tuples (player index, headset id) that were looked up in the calibration profiles
+        self.profile_lookups = set()
+
+    def setup(self):
         """
-        Main game loop function
+        Function to initialize pygame, the screens and the game state (without the cortex connection),
+        the images are decoded in a thread pool in the meantime
         """
+        assets.preload(self.preload_images)
+
+        # small mixer buffer -> collision sounds are audible in the same frame
+        SoundBank.pre_init()
         pygame.init()
         pygame.font.init()
+        startup_timer.mark("pygame.init")
+        sounds.load()
+        startup_timer.mark("sounds")
 
         # set the title of the window
         pygame.display.set_caption("Fruit Rally")
 
-        screen = pygame.display.set_mode((1024, 768))
+        self.screen = pygame.display.set_mode((1024, 768))
+        startup_timer.mark("display")
+
+        self.game_screen = GameScreen()
+        self.menu_screen = MenuScreen()
+        startup_timer.mark("screens")
+
+        self.running = True
+        self.in_menu = True
+
+        self.input_indicators = [InputIndicator(index, self.player_count) for index in range(self.player_count)]
+        self.game_states = [GameState() for _ in range(self.player_count)]
+        # the game state of the first player holds the shopping list
+        self.game_state = self.game_states[0]
+        self.dirty_renderer = DirtyRectRenderer()
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        if self.show_profiler:
+            self.profiler.set_enabled(True)
+
+        self.object_managers = []
+        # players of every object manager and player index -> GameObjectManager of the player
+        self.manager_players = []
+        self.player_managers = []
+        self.score_indicator = None
+        self.players = []
+
+        if self.music:
+            pygame.mixer.music.load("sound/GameSong.wav")
+            pygame.mixer.music.play(-1, fade_ms=1000)
+            pygame.mixer.music.set_volume(0.5)
+        startup_timer.mark("game state")
+
+        if self.skip_menu:
+            self.start_new_game()
+
+    def autopilot_target(self, index=0):
+        """
+        Function for the synthetic input in headless mode: position of the next expected object
+        :param index: index of the player
+        :return: tuple (target x, player x) or None
+        """
+        if self.in_menu or not self.player_managers:
+            return None
+        manager = self.player_managers[index]
+        player = self.players[index]
+        counter = manager.progress(player)
+        if counter >= len(manager.expected_sequence):
+            return None
+        lowest = manager.lowest_object(manager.expected_sequence[counter], player.rect.bottom)
+        if lowest is None:
+            return None
+        return lowest[0], player.rect.centerx
+
+    def create_players(self):
+        """
+        Function that creates the players and object managers of a new game: one shared object manager (versus)
+        or one object manager with own lanes per player (split)
+        """
+        expected_sequence = self.game_state.expected_sequence
+        tracks = GameObjectManager.move_tracks
+        show_labels = self.player_count > 1
+        self.players = []
+        self.object_managers = []
+        self.manager_players = []
+        self.player_managers = []
+
+        if self.mode == MODE_SPLIT:
+            lanes_per_player = len(tracks) // self.player_count
+            for index in range(self.player_count):
+                lanes = list(range(index * lanes_per_player, (index + 1) * lanes_per_player))
+                # same margins as the whole game area: 30 <= left, right <= 740
+                bounds = (tracks[lanes[0]] - 64, tracks[lanes[-1]] + 84)
+                player = Player(index, tracks[lanes[0]] + 6, bounds, show_labels)
+                manager = GameObjectManager(expected_sequence, lanes=lanes)
+                self.players.append(player)
+                self.object_managers.append(manager)
+                self.manager_players.append([player])
+                self.player_managers.append(manager)
+        else:
+            manager = GameObjectManager(expected_sequence)
+            self.object_managers.append(manager)
+            for index in range(self.player_count):
+                self.players.append(Player(index, tracks[index % len(tracks)] + 6, show_label=show_labels))
+                self.player_managers.append(manager)
+            self.manager_players.append(self.players)
+
+    def apply_calibration_profiles(self):
+        """
+        Function that sets the thresholds of the players whose headset is known and who have a calibration profile
+        """
+        if self.calibration_profiles is None or self.recalibrate:
+            return
+        for index, (input_manager, game_state) in enumerate(zip(self.input_managers, self.game_states)):
+            headset_id = input_manager.headset_id
+            if headset_id is None or (index, headset_id) in self.profile_lookups:
+                continue
+            self.profile_lookups.add((index, headset_id))
+            profile = self.calibration_profiles.get(self.users[index], headset_id)
+            if profile is not None:
+                game_state.apply_calibration_profile(profile)
+                logger.info("calibration profile of %s (%s): left %.3f right %.3f", self.users[index], headset_id,
+                            profile["left"], profile["right"])
+
+    def store_calibration_profiles(self):
+        """
+        Function that stores the thresholds of the finished calibration for every player with headset
+        """
+        if self.calibration_profiles is None:
+            return
+        for index, (input_manager, game_state) in enumerate(zip(self.input_managers, self.game_states)):
+            if input_manager.headset_id is not None:
+                self.calibration_profiles.store(self.users[index], input_manager.headset_id,
+                                                game_state.calibration_profile())
+
+    def start_new_game(self):
+        """
+        Function to start a game without the menu
+        """
+        self.game_state.new_expected_sequence()
+        pygame.event.post(pygame.event.Event(START_GAME_EVENT))
+
+    def run_frame(self):
+        """
+        Function for a single iteration of the main game loop (input, update, render)
+        :return: boolean (game is still running)
+        """
+        profiler = self.profiler
+        profiler.begin_frame()
 
-        game_screen = GameScreen()
-        menu_screen = MenuScreen()
-        # non blocking operation
-        self.input_manager.init()
+        events = pygame.event.get()
+        input_events = [input_manager.on_loop(events) for input_manager in self.input_managers]
+        profiler.mark("input")
 
-        running = True
-        in_menu = True
+        for index, input_event in enumerate(input_events):
+            if input_event:
+                logger.info("event from input_manager %d: %s", index, input_event)
+                telemetry.record("input", index, input_event[1], input_event[0].name)
+
+        # dealing with inputs
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == PROFILER_OVERLAY_KEY:
+                self.show_profiler = not self.show_profiler
+                if self.show_profiler != self.profiler.enabled and self.profiler.export_path is None:
+                    self.profiler.set_enabled(self.show_profiler)
+            elif event.type == pygame.KEYDOWN and event.key == PROFILER_CAPTURE_KEY:
+                self.profiler.start_capture()
+            elif event.type == START_GAME_EVENT:
+                for game_state in self.game_states:
+                    game_state.expected_sequence = self.game_state.expected_sequence
+                    game_state.on_start_game()
+
+                self.create_players()
+                self.score_indicator = ScoreIndicator(self.player_count)
+                self.pending_inputs = [None] * self.player_count
+
+                self.in_menu = False
+                logger.info("game started")
+                telemetry.game += 1
+                telemetry.record("start", data=",".join(figure.name for figure in self.game_state.expected_sequence))
+            elif event.type == SCORE_CHANGE_EVENT:
+                self.game_states[event.player].on_score_change(event)
+            elif event.type == CALIBRATION_DONE_EVENT:
+                self.store_calibration_profiles()
+            elif event.type == END_GAME_EVENT and not self.in_menu:
+                # split mode: only the first finished player wins
+                self.in_menu = True
+                self.menu_screen.on_end_game(self.game_states[event.winner],
+                                             event.winner if self.player_count > 1 else None)
+                logger.info("game ended, winner: player %d", event.winner + 1)
+                telemetry.record("end", event.winner, self.menu_screen.score_time)
+                assets.report()
+                sounds.report()
+                text_cache.report()
+                for input_manager in self.input_managers:
+                    input_manager.report()
+                latency_tracer.report()
+                telemetry.report()
+                self.games_played += 1
+                if self.skip_menu:
+                    self.start_new_game()
+
+        # update
+        for input_indicator, input_event, game_state in zip(self.input_indicators, input_events, self.game_states):
+            input_indicator.update(input_event, game_state)
 
-        input_indicator = InputIndicator()
-        game_state = GameState()
+        if self.in_menu:
+            # the profiles are only needed before the calibration page
+            if self.menu_screen.current_page == 0:
+                self.apply_calibration_profiles()
+            self.menu_screen.update(input_events, self.game_states)
+        else:
+            for index, input_event in enumerate(input_events):
+                if input_event:
+                    self.pending_inputs[index] = input_event
+
+        # fixed timestep simulation: the number of steps depends on the real frame time
+        steps = simulation_clock.begin_frame()
+        for _ in range(steps):
+            dt = simulation_clock.step()
+            if not self.in_menu:
+                for object_manager in self.object_managers:
+                    object_manager.on_loop()
+                for index, player in enumerate(self.players):
+                    player.update(self.pending_inputs[index], self.game_states[index])
+                    self.pending_inputs[index] = None
+                for object_manager, players in zip(self.object_managers, self.manager_players):
+                    object_manager.update(players, dt)
+
+        if not self.in_menu:
+            self.score_indicator.update(self.game_states)
+        profiler.mark("update")
+
+        # render
+        screen = self.screen
+        use_dirty_rects = self.dirty_rendering and not self.in_menu
+        dirty_rects = []
+
+        # the static layer of the game screen and of the menu pages covers the whole screen -> no fill
+        if use_dirty_rects:
+            # static layers only once per game, afterwards the dynamic regions of the last frame are erased
+            self.dirty_renderer.restore(screen, self.object_managers, self.game_screen.render)
+
+        if self.in_menu:
+            self.menu_screen.render(screen)
+        else:
+            if not use_dirty_rects:
+                self.game_screen.render(screen)
+            dirty_rects += self.score_indicator.render(screen)
+            for player in self.players:
+                dirty_rects += player.render(screen)
+            # objects are drawn between the last two simulation steps
+            for object_manager in self.object_managers:
+                dirty_rects += object_manager.render(screen, simulation_clock.alpha())
+
+        for input_indicator in self.input_indicators:
+            dirty_rects += input_indicator.render(screen)
+        if self.show_profiler:
+            dirty_rects += self.profiler_overlay.render(screen)
+        profiler.mark("render")
+        # game update
+        if use_dirty_rects:
+            self.dirty_renderer.present(dirty_rects)
+        else:
+            pygame.display.update()
+        latency_tracer.on_present()
+        profiler.mark("present")
+        if startup_timer.running:
+            startup_timer.finish()
+            # the remaining preloaded images are decoded by now
+            assets.wait()
+
+        return self.running
 
-        object_manager = None
-        score_indicator = None
-        player = None
+    def start(self):
+        """
+        Main game loop function (cooperator mode): the frame rate is capped with a sleep inside the reactor thread
+        """
+        from twisted.internet import reactor
 
-        pygame.mixer.music.load("sound/GameSong.wav")
-        pygame.mixer.music.play(-1, fade_ms=1000)
-        pygame.mixer.music.set_volume(0.5)
+        # non blocking operation, the connection is established before the setup
+        self.input_manager.init(self.input_managers)
+        startup_timer.mark("cortex connect")
+        yield
+        self.setup()
 
         # main game loop
-        while running:
-            events = pygame.event.get()
-            input_event = self.input_manager.on_loop(events)
+        while self.run_frame():
+            self.clock.tick(self.fps)
+            self.profiler.end_frame()
+            # yield sequence generator(for concurrency in coop)
+            yield
 
-            if not in_menu:
-                object_manager.on_loop()
+        self.input_manager.stop()
+        reactor.stop()
 
-            if input_event:
-                logging.info("event from input_manager: {0}".format(input_event))
+    def start_timer(self):
+        """
+        Main game loop function (timer mode): every frame is scheduled by the reactor, there is no blocking sleep
+        between frames, so websocket messages are handled as soon as a frame is done
+        """
+        from twisted.internet.task import LoopingCall
 
-            # dealing with inputs
-            for event in events:
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == START_GAME_EVENT:
-                    game_state.on_start_game()
+        self.input_manager.init(self.input_managers)
+        startup_timer.mark("cortex connect")
+        self.setup()
 
-                    object_manager = GameObjectManager(game_state.expected_sequence)
-                    score_indicator = ScoreIndicator()
-                    player = Player()
+        self.frame_loop = LoopingCall(self.on_timer_frame)
+        self.frame_loop.start(1.0 / self.fps)
+
+    def on_timer_frame(self):
+        """
+        Function called by the reactor for every frame in timer mode
+        """
+        if not self.run_frame():
+            from twisted.internet import reactor
+
+            self.frame_loop.stop()
+            self.input_manager.stop()
+            reactor.stop()
+            return
+        # no argument -> only measures the frame time, never sleeps
+        self.clock.tick()
+        self.profiler.end_frame()
+
+    def start_threaded(self):
+        """
+        Main game loop function (thread mode): the reactor (cortex connection) runs in its own thread,
+        pygame stays in the main thread and input is handed over by the thread safe InputManager queue
+        """
+        from twisted.internet import reactor
 
-                    in_menu = False
-                    logging.info("game started")
-                elif event.type == SCORE_CHANGE_EVENT:
-                    game_state.on_score_change(event)
-                elif event.type == END_GAME_EVENT:
-                    in_menu = True
-                    menu_screen.on_end_game(game_state)
-                    logging.info("game ended")
+        network = threading.Thread(target=reactor.run, kwargs={"installSignalHandlers": False}, daemon=True)
+        network.start()
 
-            # update
-            input_indicator.update(input_event, game_state)
+        # twisted is not thread safe -> connect from the reactor thread, the handshake runs during the setup
+        reactor.callFromThread(self.input_manager.init, self.input_managers)
+        startup_timer.mark("cortex connect")
+        self.setup()
 
-            if in_menu:
-                menu_screen.update(input_event, game_state)
-            else:
-                score_indicator.update(game_state)
-                player.update(input_event, game_state)
-                object_manager.update(player)
+        while self.run_frame():
+            self.clock.tick(self.fps)
+            self.profiler.end_frame()
 
-            # render
-            screen.fill(BLACK)
+        reactor.callFromThread(self.input_manager.stop)
+        reactor.callFromThread(reactor.stop)
+        network.join(timeout=2.0)
 
-            if in_menu:
-                menu_screen.render(screen)
-            else:
-                game_screen.render(screen)
-                score_indicator.render(screen)
-                player.render(screen)
-                object_manager.render(screen)
+    def start_headless(self, frames=0, games=0):
+        """
+        Main game loop function (headless mode): no reactor, no window, no frame cap
+        runs until the number of frames or games is reached and prints the timings of every phase
+        :param frames: number of frames (0 -> no limit)
+        :param games: number of finished games (0 -> no limit)
+        """
+        self.setup()
+        self.input_manager.init(self.input_managers)
+        self.profiler.enabled = True
 
-            input_indicator.render(screen)
-            # game update
-            pygame.display.update()
+        time_start = time.perf_counter()
+        while self.run_frame():
             self.clock.tick(self.fps)
-            # yield sequence generator(for concurrency in coop)
-            yield
+            self.profiler.end_frame()
+            if frames and self.profiler.frames >= frames:
+                break
+            if games and self.games_played >= games:
+                break
 
-        reactor.stop()
+        if self.profiler.export_path is not None:
+            self.profiler.export()
+        print("{0} games played".format(self.games_played))
+        print(startup_timer.report())
+        print(self.profiler.report(time.perf_counter() - time_start))
 
 
 def main():
     """
     Starter function
     """
-    logging.basicConfig(level=logging.DEBUG)
-
-    game = Game()
-    coop = Cooperator()
-    # for control of game loop and ws connection -> yield (only for cooperator)
-    coop.coiterate(game.start())
-    # uses scheduler
-    reactor.run()
+    startup_timer.mark("imports")
+    parser = argparse.ArgumentParser(description="Fruit Rally")
+    parser.add_argument("--dirty-rects", action="store_true", help="update only changed screen regions")
+    parser.add_argument("--loop", choices=[LOOP_COOPERATOR, LOOP_TIMER, LOOP_THREAD], default=LOOP_COOPERATOR,
+                        help="execution mode of the game loop and the cortex connection")
+    parser.add_argument("--measure-reactor-lag", action="store_true",
+                        help="log how long the reactor is blocked before it can handle messages")
+    parser.add_argument("--headless", action="store_true",
+                        help="no display, no audio, no frame cap, synthetic input instead of cortex")
+    parser.add_argument("--frames", type=int, default=0, help="headless: stop after this number of frames")
+    parser.add_argument("--games", type=int, default=0, help="headless: stop after this number of games")
+    parser.add_argument("--test-server", action="store_true",
+                        help="connect to the local stand-in server (python -m src.cortex.standInServer)")
+    parser.add_argument("--no-session-cache", action="store_true",
+                        help="always run the full cortex handshake (no cached token/session)")
+    parser.add_argument("--streams", default="com",
+                        help="comma separated cortex streams, e.g. com,pow,eeg (com controls the player)")
+    parser.add_argument("--record", metavar="PATH", help="record the received mental commands into a file")
+    parser.add_argument("--replay", metavar="PATH", help="use a recorded session instead of cortex")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="replay speed (1 -> recorded timing, 10 -> ten times faster, 0 -> as fast as possible)")
+    parser.add_argument("--players", type=int, choices=[1, 2, 3, 4], default=1,
+                        help="number of players, one headset each (keyboard: arrows, A/D, J/L, keypad 4/6)")
+    parser.add_argument("--mode", choices=[MODE_VERSUS, MODE_SPLIT], default=MODE_VERSUS,
+                        help="multiplayer: catch the same objects (versus) or own lanes per player (split)")
+    parser.add_argument("--profile", action="store_true",
+                        help="show the frame phase percentiles (F3 toggles, F4 captures 120 frames with cProfile)")
+    parser.add_argument("--profile-export", metavar="PATH",
+                        help="append the frame phase percentiles every 10 s to PATH (.csv or json lines)")
+    parser.add_argument("--user", default="default",
+                        help="user name (comma separated per player), returning users skip the calibration")
+    parser.add_argument("--recalibrate", action="store_true",
+                        help="calibrate even if calibration profiles exist and replace them")
+    parser.add_argument("--log-level", default=None,
+                        help="level of the log (default: DEBUG, headless: WARNING)")
+    parser.add_argument("--log-levels", default="",
+                        help="comma separated levels of subsystems, e.g. src.cortex=INFO,src.objectManager=WARNING")
+    parser.add_argument("--log-sync", action="store_true",
+                        help="format and write the log in the game thread instead of a background thread")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="append spawns, input events, collisions and scores of the session to a SQLite file")
+    parser.add_argument("--event-log", metavar="PATH",
+                        help="write the samples of all cortex streams into a compact binary file")
+    args = parser.parse_args()
+    if args.mode == MODE_SPLIT and args.players > 2:
+        parser.error("split mode needs at least two lanes per player (max. 2 players)")
+    if (args.record or args.replay) and args.players > 1:
+        # the recording format has no player index, only the first headset would be recorded/replayed
+        parser.error("--record and --replay support only one player")
+
+    recording = None
+    if args.replay:
+        try:
+            recording = CommandRecording(args.replay)
+        except (OSError, ValueError) as error:
+            parser.error("--replay: {0}".format(error))
+
+    setup_logging(args.log_level or ("WARNING" if args.headless else "DEBUG"), parse_levels(args.log_levels),
+                  use_queue=not args.log_sync)
+    if args.event_log:
+        event_log.open(args.event_log)
+    if args.telemetry:
+        telemetry.open(args.telemetry, args.players, args.mode)
+
+    if args.headless:
+        # has to be set before pygame.init()
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+        game = Game(players=args.players, mode=args.mode)
+        # every frame is 1/60 s of simulation and input time -> games run faster than real time
+        simulation_clock.virtual_frame_ms = 1000.0 / 60
+        for index, input_manager in enumerate(game.input_managers):
+            input_manager.get_ticks = simulation_clock.get_ticks
+            if recording is not None and index == 0:
+                input_manager.input_source = ReplayInputSource(
+                    recording, args.replay_speed, clock=lambda: simulation_clock.time / 1000.0, loop=True)
+            else:
+                input_manager.input_source = SyntheticInputSource(
+                    target=functools.partial(game.autopilot_target, index),
+                    clock=lambda: simulation_clock.time / 1000.0)
+        game.dirty_rendering = args.dirty_rects
+        game.fps = 0
+        game.music = False
+        game.skip_menu = True
+        game.show_profiler = args.profile
+        game.profiler.export_path = args.profile_export
+        game.start_headless(args.frames or (0 if args.games else 600), args.games)
+        return
+
+    game = Game(players=args.players, mode=args.mode)
+    game.dirty_rendering = args.dirty_rects
+    game.show_profiler = args.profile
+    users = [user for user in args.user.split(",") if user]
+    for index in range(min(len(users), game.player_count)):
+        game.users[index] = users[index]
+    game.calibration_profiles = CalibrationProfiles()
+    game.calibration_profiles.load()
+    game.recalibrate = args.recalibrate
+    if args.profile_export:
+        game.profiler.export_path = args.profile_export
+        game.profiler.enabled = True
+    game.input_manager.use_test_server = args.test_server
+    if args.no_session_cache:
+        game.input_manager.session_cache = None
+    game.input_manager.cortex_streams = tuple(name for name in args.streams.split(",") if name)
+    if recording is not None:
+        game.input_manager.input_source = ReplayInputSource(recording, args.replay_speed)
+    if args.record:
+        game.input_manager.recorder = CommandRecorder(args.record)
+
+    from twisted.internet import reactor
+    from twisted.internet.task import Cooperator
+    from src.reactorLag import ReactorLagMonitor
+    startup_timer.mark("twisted")
+
+    if args.measure_reactor_lag:
+        lag_monitor = ReactorLagMonitor()
+        reactor.callWhenRunning(lag_monitor.start)
+
+    if args.loop == LOOP_THREAD:
+        game.start_threaded()
+    elif args.loop == LOOP_TIMER:
+        reactor.callWhenRunning(game.start_timer)
+        reactor.run()
+    else:
+        coop = Cooperator()
+        # for control of game loop and ws connection -> yield (only for cooperator)
+        coop.coiterate(game.start())
+        # uses scheduler
+        reactor.run()
+
+    if game.input_manager.recorder is not None:
+        game.input_manager.recorder.close()
 
 
 if __name__ == "__main__":
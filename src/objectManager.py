@@ -1,9 +1,18 @@
 from src.objectType import GameObjectType
 from src.gameObject import GameObject
+from src.soundBank import sounds
+from src.simulationClock import simulation_clock
+from src.objectStore import ObjectStore
+from src.telemetry import telemetry
 
 import pygame
 import logging
 import random
+from collections import deque
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 END_GAME_EVENT = pygame.USEREVENT + 2
 SCORE_CHANGE_EVENT = pygame.USEREVENT + 3
@@ -11,88 +20,183 @@ SCORE_CHANGE_EVENT = pygame.USEREVENT + 3
 
 class GameObjectManager:
     """
-    Class to manage all objects in a game
+    Class to manage all objects in a game, the players of a manager compete for the same objects (versus)
     """
     move_tracks = [94, 281, 469, 656]
-    active_objects = []
-    time_last_object = 0
-    next_random_delay = 0
-    sequence_counter = 0
 
-    def __init__(self, expected_sequence, max_objects=5):
+    def __init__(self, expected_sequence, max_objects=5, lanes=None):
         """
         Python method as a construct to initialize variables
 
         :param expected_sequence: list of generated objects on the shopping list
         :param max_objects: max number of objects on the screen on the same time
+        :param lanes: indexes of the used move tracks (split lane mode), default: all
         """
         self.expected_sequence = expected_sequence
         self.max_objects = max_objects
+        self.time_last_object = 0
+        self.next_random_delay = 0
+        # player index -> number of matched objects of the shopping list
+        self.sequence_counters = {}
+        self.finished = False
+        self.store = ObjectStore()
+        self.tracks = [self.move_tracks[index] for index in (lanes if lanes is not None else range(len(self.move_tracks)))]
+        # one queue of store slots per move track, ordered by y: objects fall with the same speed, so the object
+        # at the front (index 0) is always the lowest one of its lane
+        self.lanes = [deque() for _ in self.tracks]
+        # images of the object types (index = type - 1), taken from the registry at the first render (display format)
+        self.images = None
+
+    @property
+    def object_count(self):
+        """
+        Number of objects on the screen
+        """
+        return self.store.count
 
     def on_loop(self):
         """
         Function that generates random game objects to shown on the screen.
 
         """
-        time_passed = pygame.time.get_ticks() - self.time_last_object
+        time_passed = simulation_clock.get_ticks() - self.time_last_object
         if time_passed > (1500 + self.next_random_delay):
-            if len(self.active_objects) < self.max_objects:
-                self.active_objects.append(self.generate_new_object())
+            if self.object_count < self.max_objects:
+                self.generate_new_object()
                 self.next_random_delay = random.randint(500, 1500)
-                self.time_last_object = pygame.time.get_ticks()
+                self.time_last_object = simulation_clock.get_ticks()
 
-    def generate_new_object(self):
+    def generate_new_object(self, lane=None, y=GameObject.start_y):
         """
         Object and position generator
-        :return: GameObject with the new generated object and its position
+        :param lane: index of the move track of this manager (random if None)
+        :param y: start position, has to be above all objects of the lane
+        :return: slot of the new object in the ObjectStore
         """
-        x_pos = random.choice(self.move_tracks)
+        if lane is None:
+            lane = random.randrange(len(self.tracks))
         object_type = random.choice(list(GameObjectType))
-        return GameObject(object_type, x_pos)
+        slot = self.store.spawn(object_type, self.tracks[lane], y)
+        self.lanes[lane].append(slot)
+        telemetry.record("spawn", value=self.tracks[lane], data=object_type.name)
+        return slot
 
-    def update(self, player):
+    def lowest_object(self, object_type, max_top):
         """
-        Function that updates objects on the screen and detect any collisions between an object and the player
+        Function that finds the lowest object of a type that is not below a line
+        :param object_type: type of the object
+        :param max_top: max y of the object top
+        :return: tuple (x, y) or None
+        """
+        store = self.store
+        half_height = GameObject.size[1] / 2
+        candidates = store.alive & (store.types == object_type) & (store.y - half_height < max_top)
+        if not candidates.any():
+            return None
+        slot = np.flatnonzero(candidates)[np.argmax(store.y[candidates])]
+        return store.x[slot], store.y[slot]
+
+    def player_lanes(self, player):
+        """
+        Function that finds the lanes the player can collide with
         :param player: object of Player class
+        :return: list of lane indexes
         """
-        to_delete = []
-
-        for obj in self.active_objects:
-            obj.update()
-
-            if pygame.sprite.collide_rect(player, obj):
-                logging.info("Sprite collision with {0}".format(obj.object_type.name))
-                logging.info("Expected object: {0}".format(self.expected_sequence[self.sequence_counter].name))
-
-                penalty = 0
-                if obj.object_type == self.expected_sequence[self.sequence_counter]:
-                    pygame.mixer.Sound("sound/magic-chime.wav").play()
-                    self.sequence_counter = self.sequence_counter + 1
-
-                    if self.sequence_counter >= len(self.expected_sequence):
-                        event = pygame.event.Event(END_GAME_EVENT)
-                        pygame.event.post(event)
-                else:
-                    pygame.mixer.Sound("sound/fail-buzzer.wav").play()
-                    penalty += 1
-                event = pygame.event.Event(SCORE_CHANGE_EVENT, {
-                    "penalty": penalty,
-                    "matched_objects": self.expected_sequence[:self.sequence_counter]
-                })
-                pygame.event.post(event)
-                to_delete.append(obj)
-
-            if obj.is_at_bottom():
-                to_delete.append(obj)
+        max_distance = (player.rect.width + GameObject.size[0]) / 2
+        return [index for index, track_x in enumerate(self.tracks)
+                if abs(track_x - player.rect.centerx) < max_distance]
 
-        for obj in to_delete:
-            if obj in self.active_objects:
-                self.active_objects.remove(obj)
+    def progress(self, player):
+        """
+        :param player: object of Player class
+        :return: number of matched objects of the shopping list
+        """
+        return self.sequence_counters.get(player.index, 0)
 
-    def render(self, screen):
+    def update(self, players, dt):
+        """
+        Function that updates objects on the screen and detect any collisions between an object and the players
+        :param players: list of Player objects (the first player in the list wins an object both touch)
+        :param dt: simulation step in seconds
+        """
+        store = self.store
+        store.move(GameObject.fall_speed * dt)
+
+        at_bottom = store.below(GameObject.bottom, GameObject.size[1] / 2)
+        for lane in self.lanes:
+            # only the front objects can reach the bottom first
+            while lane and at_bottom[lane[0]]:
+                store.release(lane.popleft())
+
+        for player in players:
+            for lane in (self.lanes[index] for index in self.player_lanes(player)):
+                for position, slot in enumerate(lane):
+                    rect = GameObject.rect_at(store.x[slot], store.y[slot])
+                    if rect.top > player.rect.bottom:
+                        # already below the player
+                        continue
+                    if player.rect.colliderect(rect):
+                        self.on_collision(GameObjectType(int(store.types[slot])), player)
+                        del lane[position]
+                        store.release(slot)
+                    # all following objects of the lane are above this one
+                    break
+
+    def on_collision(self, object_type, player):
+        """
+        Function that checks a caught object against the shopping list of the player and posts the score change
+        :param object_type: type of the caught object
+        :param player: object of Player class that caught the object
+        """
+        if self.finished:
+            # game already finished, END_GAME_EVENT is not handled yet
+            return
+
+        counter = self.progress(player)
+        logger.info("Sprite collision of player %d with %s", player.index + 1, object_type.name)
+        logger.info("Expected object: %s", self.expected_sequence[counter].name)
+
+        penalty = 0
+        if object_type == self.expected_sequence[counter]:
+            sounds.play("chime")
+            counter += 1
+            self.sequence_counters[player.index] = counter
+
+            if counter >= len(self.expected_sequence):
+                self.finished = True
+                event = pygame.event.Event(END_GAME_EVENT, {"winner": player.index})
+                pygame.event.post(event)
+        else:
+            sounds.play("buzzer")
+            penalty += 1
+        telemetry.record("collision", player.index, penalty, object_type.name)
+        event = pygame.event.Event(SCORE_CHANGE_EVENT, {
+            "player": player.index,
+            "penalty": penalty,
+            "matched_objects": self.expected_sequence[:counter]
+        })
+        pygame.event.post(event)
+
+    def render(self, screen, alpha=1.0):
         """
         Function to render objects on the screen
         :param screen: game screen
+        :param alpha: interpolation between the last two simulation steps
+        :return: list of drawn rectangles
         """
-        for obj in self.active_objects:
-            obj.render(screen)
+        store = self.store
+        slots = store.alive_slots()
+        if len(slots) == 0:
+            return []
+
+        half_width = GameObject.size[0] / 2
+        half_height = GameObject.size[1] / 2
+        left = (store.x[slots] - half_width).round().astype(int).tolist()
+        top = (store.interpolated_y(slots, alpha) - half_height).round().astype(int).tolist()
+        types = store.types[slots].tolist()
+
+        if self.images is None:
+            self.images = [GameObject.image_for(object_type)
+                           for object_type in range(1, len(GameObject.image_paths) + 1)]
+        images = self.images
+        return screen.blits([(images[types[i] - 1], (left[i], top[i])) for i in range(len(slots))])
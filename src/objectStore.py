@@ -0,0 +1,96 @@
+import numpy as np
+
+
+class ObjectStore:
+    """
+    Structure of arrays for all falling objects (position, type, alive flag) with slot recycling,
+    updates and bottom of screen checks work on whole arrays
+    """
+
+    def __init__(self, capacity=16):
+        """
+        Preallocates the arrays
+        :param capacity: initial number of slots (doubled when all slots are used)
+        """
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.previous_y = np.zeros(capacity, dtype=np.float64)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # lowest slot is used first
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.count = 0
+
+    def spawn(self, object_type, x, y):
+        """
+        Function that puts a new object into a free slot
+        :param object_type: type of the object
+        :param x: x position (center)
+        :param y: y position (center)
+        :return: slot index
+        """
+        if not self.free_slots:
+            self.grow()
+        slot = self.free_slots.pop()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.previous_y[slot] = y
+        self.types[slot] = object_type
+        self.alive[slot] = True
+        self.count += 1
+        return slot
+
+    def release(self, slot):
+        """
+        Function that frees the slot of a removed object
+        :param slot: slot index
+        """
+        self.alive[slot] = False
+        self.free_slots.append(slot)
+        self.count -= 1
+
+    def grow(self):
+        """
+        Function that doubles the number of slots
+        """
+        capacity = len(self.alive)
+        for name in ("x", "y", "previous_y", "types", "alive"):
+            array = getattr(self, name)
+            grown = np.zeros(capacity * 2, dtype=array.dtype)
+            grown[:capacity] = array
+            setattr(self, name, grown)
+        self.free_slots.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def move(self, dy):
+        """
+        Function that moves all alive objects down
+        :param dy: distance in pixels
+        """
+        alive = self.alive
+        self.previous_y[alive] = self.y[alive]
+        self.y[alive] += dy
+
+    def below(self, limit, half_height):
+        """
+        Function for the bottom of screen check of all objects
+        :param limit: y limit
+        :param half_height: half of the object height
+        :return: boolean array (alive and bottom edge below the limit)
+        """
+        return self.alive & (self.y + half_height > limit)
+
+    def interpolated_y(self, slots, alpha):
+        """
+        Function for the render positions between the last two updates
+        :param slots: array of slot indexes
+        :param alpha: 0.0 (previous update) to 1.0 (current update)
+        :return: array of y positions
+        """
+        previous_y = self.previous_y[slots]
+        return previous_y + (self.y[slots] - previous_y) * alpha
+
+    def alive_slots(self):
+        """
+        :return: array of slot indexes of all alive objects
+        """
+        return np.flatnonzero(self.alive)
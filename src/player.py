@@ -1,5 +1,11 @@
 import pygame
 from src.input import Input
+from src.assetRegistry import assets
+from src.inputLatency import latency_tracer
+from src.screen.textCache import text_cache
+from src.simulationClock import simulation_clock
+
+WHITE = (255, 255, 255)
 
 
 class Player(pygame.sprite.Sprite):
@@ -7,17 +13,27 @@ class Player(pygame.sprite.Sprite):
     Class to manage and update player moves (Shopping cart)
     """
     time_last_move = 0
+    label_font = None
 
-    def __init__(self):
+    def __init__(self, index=0, start_x=100, bounds=(30, 740), show_label=False):
         """
         Function that defines a player and its frame
+        :param index: index of the player (multiplayer)
+        :param start_x: x position (center) at the start of the game
+        :param bounds: tuple (min left, max right) of the cart, split lane mode limits it to the lanes of the player
+        :param show_label: draw the player number above the cart
         """
         super(Player, self).__init__()
-        self.image = pygame.image.load("img/Shopping_Cart.png")
-        self.surface = pygame.Surface((141, 107))  # width and length -> same as the image
-        self.rect = self.surface.get_rect(
-            center=(100, 660)
-        )
+        self.index = index
+        self.bounds = bounds
+        self.image = assets.image("img/Shopping_Cart.png", alpha=True)
+        self.rect = pygame.Rect(0, 0, 141, 107)  # width and length -> same as the image
+        self.rect.center = (start_x, 660)
+        self.label = None
+        if show_label:
+            if Player.label_font is None:
+                Player.label_font = pygame.font.Font('./font/verdana.ttf', 20)
+            self.label = text_cache.render(Player.label_font, "P{0}".format(index + 1), WHITE)
 
     def update(self, input_event, game_state):
         """
@@ -25,7 +41,7 @@ class Player(pygame.sprite.Sprite):
         :param input_event: current input
         :param game_state: current game state
         """
-        time_passed = pygame.time.get_ticks() - self.time_last_move
+        time_passed = simulation_clock.get_ticks() - self.time_last_move
         moved = False
 
         if time_passed > 1000:
@@ -37,17 +53,30 @@ class Player(pygame.sprite.Sprite):
                     self.rect.move_ip(-190, 0)
                     moved = True
             # dealing with the frame and movements
-            if self.rect.left < 30:
-                self.rect.left = 30
-            if self.rect.right > 740:
-                self.rect.right = 740
+            if self.rect.left < self.bounds[0]:
+                self.rect.left = self.bounds[0]
+            if self.rect.right > self.bounds[1]:
+                self.rect.right = self.bounds[1]
 
         if moved:
-            self.time_last_move = pygame.time.get_ticks()
+            self.time_last_move = simulation_clock.get_ticks()
+
+        # latency of the cortex events (keyboard events have no trace)
+        if input_event and len(input_event) > 2:
+            if moved:
+                latency_tracer.on_moved(input_event[2])
+            elif time_passed <= 1000:
+                latency_tracer.on_cooldown(input_event[2], 1000 - time_passed)
+            else:
+                latency_tracer.on_below_threshold(input_event[2])
 
     def render(self, surface):
         """
         Render function for move update
         :param surface: main game background
+        :return: list of drawn rectangles
         """
-        surface.blit(self.image, self.rect)
+        rects = [surface.blit(self.image, self.rect)]
+        if self.label is not None:
+            rects.append(surface.blit(self.label, self.label.get_rect(midbottom=self.rect.midtop)))
+        return rects
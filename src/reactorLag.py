@@ -0,0 +1,71 @@
+import logging
+import time
+from collections import deque
+
+from twisted.internet import reactor
+from twisted.internet.task import LoopingCall
+
+logger = logging.getLogger(__name__)
+
+
+class ReactorLagMonitor:
+    """
+    Class that measures how late the reactor runs a scheduled call. A websocket message that arrives while the
+    reactor is blocked (e.g. by clock.tick() or a slow frame) waits the same time before onMessage runs,
+    so the lag is the reactor side message latency.
+    """
+
+    def __init__(self, interval=0.005, report_interval=10.0, max_samples=4000):
+        """
+        :param interval: seconds between two probes
+        :param report_interval: seconds between two log reports
+        :param max_samples: number of kept samples for the statistics
+        """
+        self.interval = interval
+        self.report_interval = report_interval
+        self.samples = deque(maxlen=max_samples)
+        self.expected = 0.0
+        self.probe = None
+        self.reporter = None
+
+    def start(self):
+        """
+        Function to start probing (has to be called in the reactor thread)
+        """
+        self.expected = time.perf_counter() + self.interval
+        self.probe = reactor.callLater(self.interval, self.on_probe)
+        self.reporter = LoopingCall(self.report)
+        self.reporter.start(self.report_interval, now=False)
+
+    def on_probe(self):
+        """
+        Function that records the delay of the probe and schedules the next one
+        """
+        now = time.perf_counter()
+        self.samples.append(max(0.0, now - self.expected))
+        self.expected = now + self.interval
+        self.probe = reactor.callLater(self.interval, self.on_probe)
+
+    def stats(self):
+        """
+        Function for the lag statistics
+        :return: dict with mean, p50, p95, p99 and max lag in milliseconds
+        """
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        count = len(ordered)
+        return {
+            "samples": count,
+            "mean_ms": sum(ordered) * 1000.0 / count,
+            "p50_ms": ordered[int(count * 0.50)] * 1000.0,
+            "p95_ms": ordered[min(count - 1, int(count * 0.95))] * 1000.0,
+            "p99_ms": ordered[min(count - 1, int(count * 0.99))] * 1000.0,
+            "max_ms": ordered[-1] * 1000.0
+        }
+
+    def report(self):
+        """
+        Logs the lag statistics
+        """
+        logger.info("reactor lag: %s", self.stats())
@@ -0,0 +1,63 @@
+import time
+
+
+class ReplayInputSource:
+    """
+    Class that replaces the CortexClient with the samples of a recorded session (CommandRecording)
+    """
+
+    def __init__(self, recording, speed=1.0, clock=time.monotonic, batch_size=256, loop=False):
+        """
+        :param recording: CommandRecording
+        :param speed: replay speed (1.0 -> recorded timing, 10.0 -> ten times faster, 0 -> as fast as possible)
+        :param clock: function that returns the current time in seconds
+        :param batch_size: samples per poll when replaying as fast as possible
+        :param loop: start again after the last sample
+        """
+        self.recording = recording
+        self.speed = speed
+        self.clock = clock
+        self.batch_size = batch_size
+        self.loop = loop
+        self.position = 0
+        self.time_start = None
+
+    def is_finished(self):
+        """
+        :return: boolean (all samples replayed)
+        """
+        return self.position >= len(self.recording)
+
+    def poll(self, receiver):
+        """
+        Function that hands over all samples due since the last poll as one batch
+        :param receiver: InputManager
+        """
+        if self.is_finished():
+            if not self.loop or len(self.recording) == 0:
+                return
+            self.position = 0
+            self.time_start = None
+
+        now = self.clock()
+        if self.time_start is None:
+            self.time_start = now
+
+        samples = []
+        if self.speed > 0:
+            replay_time = (now - self.time_start) * self.speed
+            while not self.is_finished():
+                arrival_time, cortex_time, command, power = self.recording[self.position]
+                if arrival_time > replay_time:
+                    break
+                samples.append((command, power, cortex_time))
+                self.position += 1
+        else:
+            end = min(len(self.recording), self.position + self.batch_size)
+            for index in range(self.position, end):
+                arrival_time, cortex_time, command, power = self.recording[index]
+                samples.append((command, power, cortex_time))
+            self.position = end
+
+        if samples:
+            receiver.on_receive_cortex_batch(samples)
@@ -0,0 +1,49 @@
+import pygame
+
+BLACK = (0, 0, 0)
+
+
+class DirtyRectRenderer:
+    """
+    Class for the opt-in dirty rectangle rendering of the game screen: the static layers are drawn once per game,
+    afterwards only the regions changed by the dynamic layers are restored and pushed to the display
+    """
+
+    def __init__(self):
+        """
+        Initializes the background snapshot and the rectangles of the previous frame
+        """
+        self.background = None
+        self.scene = None
+        self.previous_rects = []
+        self.full_update = True
+
+    def restore(self, screen, scene, render_static):
+        """
+        Function that prepares the screen for the dynamic layers of a frame
+        :param screen: main game screen
+        :param scene: any object that identifies the current scene (a new scene forces a full redraw)
+        :param render_static: function that renders the static layers on the screen
+        """
+        if scene is not self.scene or self.background is None:
+            self.scene = scene
+            screen.fill(BLACK)
+            render_static(screen)
+            self.background = screen.copy()
+            self.full_update = True
+        else:
+            # erase the dynamic layers of the previous frame
+            for rect in self.previous_rects:
+                screen.blit(self.background, rect, rect)
+            self.full_update = False
+
+    def present(self, rects):
+        """
+        Function that pushes the changed regions (of the previous and the current frame) to the display
+        :param rects: rectangles drawn by the dynamic layers in this frame
+        """
+        if self.full_update:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.previous_rects + rects)
+        self.previous_rects = rects
@@ -1,5 +1,6 @@
 import pygame
 from src.input import Input
+from src.screen.textCache import text_cache
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -22,11 +23,22 @@ class InputIndicator:
     min_left = 0.8
     min_right = 0.8
 
-    def __init__(self):
+    def __init__(self, row=0, rows=1):
         """
         For Font initialization
+        :param row: index of the player (multiplayer: one compact bar per player)
+        :param rows: number of players
         """
         self.font = pygame.font.Font('./font/verdana.ttf', 14)
+        self.label = None
+        if rows == 1:
+            self.top = 50
+            self.height = 50
+        else:
+            # all bars between the "Signal power" title and the shopping list
+            self.top = 45 + row * 36
+            self.height = 28
+            self.label = "P{0}".format(row + 1)
 
     def update(self, input_event, game_state):
         """
@@ -52,28 +64,39 @@ class InputIndicator:
         """
         Render function for input indicator
         :param surface: game status background
+        :return: list of drawn rectangles
         """
+        top = self.top
+        height = self.height
         max_length = 115
         width_right = max_length * self.right
         width_left = max_length * self.left
         x_left = 780 + (max_length - width_left)
 
-        pygame.draw.rect(surface, LIGHT_GREY, (780, 50, 115, 50))
-        pygame.draw.rect(surface, LIGHT_GREEN, (x_left, 50, width_left, 50))
+        pygame.draw.rect(surface, LIGHT_GREY, (780, top, 115, height))
+        pygame.draw.rect(surface, LIGHT_GREEN, (x_left, top, width_left, height))
 
-        pygame.draw.rect(surface, LIGHT_GREY, (895, 50, 115, 50))
-        pygame.draw.rect(surface, LIGHT_GREEN, (895, 50, width_right, 50))
+        pygame.draw.rect(surface, LIGHT_GREY, (895, top, 115, height))
+        pygame.draw.rect(surface, LIGHT_GREEN, (895, top, width_right, height))
 
-        pygame.draw.rect(surface, BLACK, (780, 50, 230, 50), 3)
-        pygame.draw.line(surface, BLACK, (895, 50), (895, 100), 3)
+        pygame.draw.rect(surface, BLACK, (780, top, 230, height), 3)
+        pygame.draw.line(surface, BLACK, (895, top), (895, top + height), 3)
 
         limit_left = 895 - (max_length * self.min_left)
         limit_right = 895 + (max_length * self.min_right)
-        pygame.draw.line(surface, ORANGE, (limit_left, 45), (limit_left, 105), 3)
-        pygame.draw.line(surface, ORANGE, (limit_right, 45), (limit_right, 105), 3)
+        pygame.draw.line(surface, ORANGE, (limit_left, top - 5), (limit_left, top + height + 5), 3)
+        pygame.draw.line(surface, ORANGE, (limit_right, top - 5), (limit_right, top + height + 5), 3)
 
-        text_left = self.font.render("Left", True, WHITE)
-        text_right = self.font.render("Right", True, WHITE)
+        # bar with limit lines
+        rects = [pygame.Rect(776, top - 7, 238, height + 15)]
 
-        surface.blit(text_left, text_left.get_rect(center=(800, 120)))
-        surface.blit(text_right, text_left.get_rect(center=(980, 120)))
\ No newline at end of file
+        if self.label is not None:
+            text_label = text_cache.render(self.font, self.label, BLACK)
+            rects.append(surface.blit(text_label, text_label.get_rect(midleft=(784, top + height // 2))))
+            return rects
+
+        text_left = text_cache.render(self.font, "Left", WHITE)
+        text_right = text_cache.render(self.font, "Right", WHITE)
+        rects.append(surface.blit(text_left, text_left.get_rect(center=(800, 120))))
+        rects.append(surface.blit(text_right, text_left.get_rect(center=(980, 120))))
+        return rects
@@ -1,5 +1,8 @@
 import pygame
 
+from src.assetRegistry import assets
+from src.screen.textCache import text_cache
+
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
@@ -16,37 +19,46 @@ class GameScreen:
      """
     def __init__(self):
         """
-        Initializes fonts, backgrounds and additional game info
+        Initializes fonts, backgrounds and additional game info and bakes them into one static layer
         """
         self.font_text = pygame.font.Font('./font/verdana.ttf', 30)
 
-        game_surface = pygame.Surface((750, 750))
-        self.background = pygame.image.load("img/background.png").convert(game_surface)
-
-        game_status_surface = pygame.Surface((750, 250))
-        self.game_status_background = pygame.image.load("img/game_status.png").convert(game_status_surface)
+        self.background = assets.image("img/background.png")
+        self.game_status_background = assets.image("img/game_status.png")
 
-        self.list_text = self.font_text.render("Shopping list:", True, WHITE)
+        self.list_text = text_cache.render(self.font_text, "Shopping list:", WHITE)
         self.list_rect = self.list_text.get_rect(center=(890, 200))
 
-        self.counter_text = self.font_text.render("Game timer:", True, WHITE)
+        self.counter_text = text_cache.render(self.font_text, "Game timer:", WHITE)
         self.content_rect = self.counter_text.get_rect(center=(890, 500))
 
-        self.power_of_signal_text = self.font_text.render("Signal power:", True, WHITE)
+        self.power_of_signal_text = text_cache.render(self.font_text, "Signal power:", WHITE)
         self.power_of_signal_rect = self.power_of_signal_text.get_rect(center=(890, 25))
 
+        self.static_layer = self.create_static_layer()
+
+    def create_static_layer(self):
+        """
+        Function that draws the static layers (background, lane lines, status panel, labels) once
+        :return: pygame.Surface of the whole screen
+        """
+        layer = pygame.Surface((1024, 768))
+        layer.fill(BLACK)
+        background_rect = layer.blit(self.background, (9, 9))
+        # for debugging, the shared background surface stays untouched
+        self.draw_lines(layer.subsurface(background_rect))
+        layer.blit(self.game_status_background, (770, 9))
+        layer.blit(self.list_text, self.list_rect)
+        layer.blit(self.counter_text, self.content_rect)
+        layer.blit(self.power_of_signal_text, self.power_of_signal_rect)
+        return layer
+
     def render(self, screen):
         """
-        Render function for the background and information on the game screen
+        Render function for the background and information on the game screen (one blit of the static layer)
         :param screen: main game screen
         """
-        screen.blit(self.background, (9, 9))
-        screen.blit(self.game_status_background, (770, 9))
-        screen.blit(self.list_text, self.list_rect)
-        screen.blit(self.counter_text, self.content_rect)
-        screen.blit(self.power_of_signal_text, self.power_of_signal_rect)
-        # for debugging
-        self.draw_lines(self.background)
+        screen.blit(self.static_layer, (0, 0))
 
     def draw_lines(self, background):
         """
@@ -58,4 +70,3 @@ class GameScreen:
         pygame.draw.line(background, WHITE, (187, 0), (187, 900), 3)
         pygame.draw.line(background, WHITE, (375, 0), (375, 900), 3)
         pygame.draw.line(background, WHITE, (562, 0), (562, 900), 3)
-
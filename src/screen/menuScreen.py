@@ -1,7 +1,13 @@
 from datetime import datetime
+import logging
 import pygame
 from src.input import Input
 from src.gameObject import GameObject
+from src.assetRegistry import assets
+from src.screen.textCache import text_cache
+from src.simulationClock import simulation_clock
+
+logger = logging.getLogger(__name__)
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -16,6 +22,7 @@ DARK_BLUE = (14, 7, 112)
 START_GAME_EVENT = pygame.USEREVENT + 1
 END_GAME_EVENT = pygame.USEREVENT + 2
 SCORE_CHANGE_EVENT = pygame.USEREVENT + 3
+CALIBRATION_DONE_EVENT = pygame.USEREVENT + 4
 
 
 class MenuScreen:
@@ -44,24 +51,26 @@ class MenuScreen:
         self.font_command = pygame.font.Font('./font/verdana.ttf', 36)
         self.font_title = pygame.font.Font('./font/verdana.ttf', 40)
 
-        menu_surface = pygame.Surface((750, 750))
-        menu_background = pygame.image.load("img/menu1.png").convert(menu_surface)
-        self.background = menu_background
-        game_status_surface = pygame.Surface((750, 250))
-        self.game_status_background = pygame.image.load("img/game_status.png").convert(game_status_surface)
+        self.background = assets.image("img/menu1.png")
+        self.game_status_background = assets.image("img/game_status.png")
+        # page background -> static layer of the page (background, status panel, labels, score)
+        self.static_layers = {}
 
     def set_menu_page(self, page_number):
-        self.time_page_shown = pygame.time.get_ticks()
+        self.time_page_shown = simulation_clock.get_ticks()
         self.current_page = page_number
 
-    def update(self, input_event, game_state):
+    def update(self, input_events, game_states):
         """
-        Function that updates menu by managing inputs from the player based on the signal power
-        :param input_event: type of the input
-        :param game_state: current game state
+        Function that updates menu by managing inputs from the player based on the signal power,
+        the first player navigates the menu, the signals of all players are calibrated at the same time
+        :param input_events: type of the input of every player
+        :param game_states: current game state of every player
         """
+        input_event = input_events[0]
+        game_state = game_states[0]
         if not self.is_countdown:
-            time_passed = pygame.time.get_ticks() - self.time_page_shown
+            time_passed = simulation_clock.get_ticks() - self.time_page_shown
 
             # show every page at least 2 seconds
             if time_passed > 2000:
@@ -73,52 +82,47 @@ class MenuScreen:
                         if input_event[0] == Input.RIGHT and input_event[1] > game_state.min_signal_weight_right:
                             self.set_menu_page(self.current_page + 1)
 
-            if self.current_page == 1:
-                menu_surface = pygame.Surface((750, 750))
-                menu_background = pygame.image.load("img/menu_focus.png").convert(menu_surface)
-                self.background = menu_background
+            # returning players: the thresholds of all players were loaded from their calibration profiles
+            if self.current_page == 1 and all(state.profile_loaded for state in game_states):
+                logger.info("calibration skipped, thresholds of the calibration profiles")
+                self.set_menu_page(2)
 
-                game_status_surface = pygame.Surface((750, 250))
-                self.game_status_background = pygame.image.load("img/game_status.png").convert(game_status_surface)
+            if self.current_page == 1:
+                self.background = assets.image("img/menu_focus.png")
+                self.game_status_background = assets.image("img/game_status.png")
 
-                game_state.reset_signal_weight()
+                for state in game_states:
+                    state.reset_signal_weight()
 
                 self.is_countdown = True
                 self.is_collecting_signals = True
                 self.direction_collecting_signal = Input.LEFT
                 self.countdown_in_seconds = 15
-                self.time_countdown_start = pygame.time.get_ticks()
+                self.time_countdown_start = simulation_clock.get_ticks()
 
             if self.current_page == 2:
-                menu_surface = pygame.Surface((750, 750))
-                menu_background = pygame.image.load("img/menu2.png").convert(menu_surface)
-                self.background = menu_background
-
-                game_status_surface = pygame.Surface((750, 250))
-                self.game_status_background = pygame.image.load("img/game_status.png").convert(game_status_surface)
+                self.background = assets.image("img/menu2.png")
+                self.game_status_background = assets.image("img/game_status.png")
 
             elif self.current_page == 3:
-                menu2_surface = pygame.Surface((750, 750))
-                menu2_background = pygame.image.load("img/menu3.png").convert(menu2_surface)
-                self.background = menu2_background
-
-                game_status_surface = pygame.Surface((750, 250))
-                self.game_status_background = pygame.image.load("img/game_status.png").convert(game_status_surface)
+                self.background = assets.image("img/menu3.png")
+                self.game_status_background = assets.image("img/game_status.png")
 
                 game_state.new_expected_sequence()
 
                 self.is_countdown = True
                 self.countdown_in_seconds = 7
-                self.time_countdown_start = pygame.time.get_ticks()
+                self.time_countdown_start = simulation_clock.get_ticks()
 
         else:
-            time_passed = pygame.time.get_ticks() - self.time_countdown_start
+            time_passed = simulation_clock.get_ticks() - self.time_countdown_start
             seconds_left = int(self.countdown_in_seconds - (time_passed / 1000))
 
             self.command = "{0} seconds".format(seconds_left)
 
             if self.is_collecting_signals:
-                game_state.update_signal_weight(input_event, self.direction_collecting_signal)
+                for event, state in zip(input_events, game_states):
+                    state.update_signal_weight(event, self.direction_collecting_signal)
 
                 if seconds_left <= 0:
                     if self.direction_collecting_signal == Input.LEFT:
@@ -126,8 +130,11 @@ class MenuScreen:
                         self.is_collecting_signals = True
                         self.direction_collecting_signal = Input.RIGHT
                         self.countdown_in_seconds = 15
-                        self.time_countdown_start = pygame.time.get_ticks()
+                        self.time_countdown_start = simulation_clock.get_ticks()
                     else:
+                        for index, state in enumerate(game_states):
+                            logger.info("calibration of player %d: %s", index + 1, state.calibration_summary())
+                        pygame.event.post(pygame.event.Event(CALIBRATION_DONE_EVENT))
                         self.is_countdown = False
                         self.is_collecting_signals = False
                         self.direction_collecting_signal = None
@@ -136,18 +143,18 @@ class MenuScreen:
             else:
                 self.output_images = []
                 for figure in game_state.expected_sequence:
-                    image_pos = figure - 1
-                    image = GameObject.images[image_pos]
+                    image = GameObject.image_for(figure)
                     self.output_images.append(image)
 
                 if seconds_left <= 0:
                     event = pygame.event.Event(START_GAME_EVENT)
                     pygame.event.post(event)
 
-    def on_end_game(self, game_state):
+    def on_end_game(self, game_state, winner=None):
         """
         Function to react on end of the game event
-        :param game_state: current game state
+        :param game_state: current game state (of the winner)
+        :param winner: index of the winner (multiplayer) or None
         """
         self.set_menu_page(2)
         self.is_countdown = False
@@ -155,45 +162,62 @@ class MenuScreen:
         self.command = ""
         self.output_images = []
 
-        self.score = "Previous score:"
-        self.score_time = pygame.time.get_ticks() - game_state.time_game_started
+        self.score = "Previous score:" if winner is None else "Player {0} won:".format(winner + 1)
+        self.score_time = simulation_clock.get_ticks() - game_state.time_game_started
         self.score_time += (game_state.penalties * 5000)
         self.score_time /= 1000
+        # new score -> all pages are drawn again
+        self.static_layers.clear()
+
+    def static_layer(self):
+        """
+        Function for the static layer of the current page, it is drawn only on the first request after a page
+        change or a new score
+        :return: pygame.Surface of the whole screen
+        """
+        layer = self.static_layers.get(self.background)
+        if layer is not None:
+            return layer
+
+        layer = pygame.Surface((1024, 768))
+        layer.fill(BLACK)
+        layer.blit(self.background, (9, 9))
+        layer.blit(self.game_status_background, (770, 9))
+
+        power_of_signal_text = text_cache.render(self.font_text, self.power_of_signal, WHITE)
+        layer.blit(power_of_signal_text, power_of_signal_text.get_rect(center=(890, 25)))
+
+        score_text = text_cache.render(self.font_text, self.score, WHITE)
+        layer.blit(score_text, score_text.get_rect(center=(890, 500)))
+
+        if self.is_end_of_game:
+            score_time_text = datetime.fromtimestamp(self.score_time).strftime('%M:%S')
+            text_timer = text_cache.render_digits(self.font_text, score_time_text, WHITE)
+            layer.blit(text_timer, text_timer.get_rect(center=(890, 550)))
+
+        self.static_layers[self.background] = layer
+        return layer
 
     def render(self, screen):
         """
         Render function for the background and information in menu
         :param screen: main game screen
         """
-        screen.blit(self.background, (9, 9))
-        screen.blit(self.game_status_background, (770, 9))
+        screen.blit(self.static_layer(), (0, 0))
 
         i = 250
         for img in self.output_images:
-            surface = pygame.Surface((100, 100))
-            rect = surface.get_rect(center=(350, i))
+            rect = pygame.Rect(0, 0, 100, 100)
+            rect.center = (350, i)
             screen.blit(img, rect)
             i = i + 100
 
-        content_text = self.font_command.render(self.command, True, WHITE)
+        content_text = text_cache.render(self.font_command, self.command, WHITE)
         content_rect = content_text.get_rect(center=(375, 575))
         screen.blit(content_text, content_rect)
 
         if self.is_collecting_signals:
-            calibration_text = self.font_title.render("On {0}".format(self.direction_collecting_signal.name), True, DARK_BLUE)
+            calibration_text = text_cache.render(self.font_title, "On {0}".format(self.direction_collecting_signal.name),
+                                                 DARK_BLUE)
             calibration_rect = calibration_text.get_rect(center=(375, 355))
             screen.blit(calibration_text, calibration_rect)
-
-        power_of_signal_text = self.font_text.render(self.power_of_signal, True, WHITE)
-        power_of_signal_rect = power_of_signal_text.get_rect(center=(890, 25))
-        screen.blit(power_of_signal_text, power_of_signal_rect)
-
-        score_text = self.font_text.render(self.score, True, WHITE)
-        score_rect = score_text.get_rect(center=(890, 500))
-        screen.blit(score_text, score_rect)
-
-        if self.is_end_of_game:
-            score_time_text = datetime.fromtimestamp(self.score_time).strftime('%M:%S')
-            text_timer = self.font_text.render(score_time_text, True, WHITE)
-            text_rect_timer = text_timer.get_rect(center=(890, 550))
-            screen.blit(text_timer, text_rect_timer)
\ No newline at end of file
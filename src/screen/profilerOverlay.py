@@ -0,0 +1,55 @@
+import time
+
+import pygame
+
+WHITE = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 170)
+
+
+class ProfilerOverlay:
+    """
+    Class for the on-screen table of the frame phase percentiles (p50/p95/p99), left of the input indicator
+    """
+    # the text is rendered again only twice per second
+    refresh_interval = 0.5
+    position = (560, 15)
+
+    def __init__(self, profiler):
+        """
+        :param profiler: FrameProfiler of the game loop
+        """
+        self.profiler = profiler
+        self.font = pygame.font.Font('./font/verdana.ttf', 12)
+        self.surface = None
+        self.time_last_refresh = 0.0
+
+    def refresh(self):
+        """
+        Function that renders the table onto a transparent surface
+        """
+        rows = [("ms", "p50", "p95", "p99")]
+        for name, values in self.profiler.frame_percentiles().items():
+            rows.append((name,) + tuple("{0:.2f}".format(value) for value in values))
+
+        line_height = self.font.get_linesize()
+        self.surface = pygame.Surface((200, 8 + line_height * len(rows)), pygame.SRCALPHA)
+        self.surface.fill(OVERLAY_BACKGROUND)
+        for index, row in enumerate(rows):
+            y = 4 + index * line_height
+            self.surface.blit(self.font.render(row[0], True, WHITE), (6, y))
+            # numbers right aligned
+            for column, text in enumerate(row[1:]):
+                rendered = self.font.render(text, True, WHITE)
+                self.surface.blit(rendered, (100 + column * 48 - rendered.get_width(), y))
+
+    def render(self, screen):
+        """
+        Render function for the overlay
+        :param screen: main game screen
+        :return: list of drawn rectangles
+        """
+        now = time.perf_counter()
+        if self.surface is None or now - self.time_last_refresh >= self.refresh_interval:
+            self.time_last_refresh = now
+            self.refresh()
+        return [screen.blit(self.surface, self.position)]
@@ -3,6 +3,8 @@ import pygame
 from datetime import datetime
 from src.objectType import GameObjectType
 from src.gameObject import GameObject
+from src.screen.textCache import text_cache
+from src.simulationClock import simulation_clock
 
 WHITE = (255, 255, 255)
 
@@ -11,21 +13,35 @@ class ScoreIndicator:
     """
     Class to manage game score and update matched objects
     """
-    def __init__(self):
+    def __init__(self, players=1):
         """
         Additional variables initialization
+        :param players: number of players (multiplayer: one progress line per player instead of the images)
         """
         self.font = pygame.font.Font('./font/verdana.ttf', 30)
+        self.font_players = pygame.font.Font('./font/verdana.ttf', 24)
+        self.players = players
         self.timer_text = "00:00:00"
         self.matched_text = ""
         self.output_images = []
+        self.player_texts = []
 
-    def update(self, game_state):
+    def update(self, game_states):
         """
         Function for updating game timer and matched figures
-        :param game_state: current game state
+        :param game_states: current game state of every player
         """
-        game_time = pygame.time.get_ticks() - game_state.time_game_started
+        game_state = game_states[0]
+        game_time = simulation_clock.get_ticks() - game_state.time_game_started
+
+        if self.players > 1:
+            # penalties are shown per player
+            self.timer_text = datetime.fromtimestamp(game_time / 1000).strftime('%M:%S')
+            self.player_texts = ["P{0}  {1}/{2}  +{3}s".format(
+                index + 1, len(state.matched_sequence), len(state.expected_sequence), state.penalties * 5)
+                for index, state in enumerate(game_states)]
+            return
+
         game_time += (game_state.penalties * 5000)
 
         self.timer_text = datetime.fromtimestamp(game_time / 1000).strftime('%M:%S')
@@ -33,26 +49,33 @@ class ScoreIndicator:
         self.output_images = []
         for figure in game_state.matched_sequence:
             figure_numb = GameObjectType[figure.name]
-            image = GameObject.images[figure_numb - 1]
+            image = GameObject.image_for(figure_numb)
             self.output_images.append(image)
 
     def render(self, surface):
         """
         Render function for timer and matched objects
         :param surface: game status background
+        :return: list of drawn rectangles
         """
-        text_timer = self.font.render(self.timer_text, True, WHITE)
+        text_timer = text_cache.render_digits(self.font, self.timer_text, WHITE)
         text_rect_timer = text_timer.get_rect(center=(890, 550))
-        surface.blit(text_timer, text_rect_timer)
+        rects = [surface.blit(text_timer, text_rect_timer)]
+
+        for index, text in enumerate(self.player_texts):
+            text_player = text_cache.render(self.font_players, text, WHITE)
+            rects.append(surface.blit(text_player, text_player.get_rect(center=(890, 270 + index * 50))))
 
         img_surface = pygame.Surface((100, 100))
 
         if len(self.output_images) == 1:
             rect1 = img_surface.get_rect(center=(900, 300))
-            surface.blit(self.output_images[0], rect1)
+            rects.append(surface.blit(self.output_images[0], rect1))
 
         elif len(self.output_images) == 2:
             rect1 = img_surface.get_rect(center=(900, 300))
             rect2 = img_surface.get_rect(center=(900, 400))
-            surface.blit(self.output_images[0], rect1)
-            surface.blit(self.output_images[1], rect2)
\ No newline at end of file
+            rects.append(surface.blit(self.output_images[0], rect1))
+            rects.append(surface.blit(self.output_images[1], rect2))
+
+        return rects
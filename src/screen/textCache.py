@@ -0,0 +1,123 @@
+import logging
+from collections import OrderedDict
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+
+class TextCache:
+    """
+    Bounded LRU cache for rendered text surfaces, keyed by (font, text, color, antialias)
+    """
+    digit_chars = "0123456789:"
+
+    def __init__(self, max_size=128):
+        """
+        Initializes the cache and the counters
+        :param max_size: max number of cached text surfaces
+        """
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.glyphs = {}
+        self.hits = 0
+        self.misses = 0
+        self.rasterized = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Function with the same result as font.render(), but the text is only rasterized on a cache miss
+        :param font: pygame.font.Font
+        :param text: text to render
+        :param color: text color
+        :param antialias: antialiased text
+        :return: pygame.Surface
+        """
+        key = (font, text, color, antialias)
+        surface = self.lookup(key)
+        if surface is None:
+            self.rasterized += 1
+            surface = font.render(text, antialias, color)
+            self.store(key, surface)
+        return surface
+
+    def render_digits(self, font, text, color, antialias=True):
+        """
+        Function for timers (%M:%S): the text is composed from cached digit glyphs, so a new timer value
+        does not rasterize anything once all glyphs are known
+        :param font: pygame.font.Font
+        :param text: text with digits and colons only
+        :param color: text color
+        :param antialias: antialiased text
+        :return: pygame.Surface
+        """
+        if any(char not in self.digit_chars for char in text):
+            return self.render(font, text, color, antialias)
+
+        key = (font, text, color, antialias)
+        surface = self.lookup(key)
+        if surface is None:
+            glyphs = [self.glyph(font, char, color, antialias) for char in text]
+            width = sum(glyph.get_width() for glyph in glyphs)
+            surface = pygame.Surface((width, font.get_height()), pygame.SRCALPHA)
+            x = 0
+            for glyph in glyphs:
+                surface.blit(glyph, (x, 0))
+                x += glyph.get_width()
+            self.store(key, surface)
+        return surface
+
+    def glyph(self, font, char, color, antialias):
+        """
+        Function that returns a single (never evicted) glyph surface
+        """
+        key = (font, char, color, antialias)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            self.rasterized += 1
+            glyph = font.render(char, antialias, color)
+            self.glyphs[key] = glyph
+        return glyph
+
+    def lookup(self, key):
+        """
+        Function for the LRU lookup
+        :return: cached surface or None
+        """
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def store(self, key, surface):
+        """
+        Function that adds a surface and evicts the least recently used one if the cache is full
+        """
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+
+    def stats(self):
+        """
+        Function for the cache statistics
+        :return: dict with hits, misses and the number of rasterized texts/glyphs
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rasterized": self.rasterized,
+            "cached": len(self.surfaces)
+        }
+
+    def report(self):
+        """
+        Logs the cache statistics
+        """
+        logger.info("text cache: %s", self.stats())
+
+
+# shared by all screen classes
+text_cache = TextCache()
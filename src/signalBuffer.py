@@ -0,0 +1,120 @@
+import threading
+
+import numpy as np
+
+
+class SignalRingBuffer:
+    """
+    Fixed capacity, NumPy backed and thread safe ring buffer for the samples of a cortex data stream
+    (eeg, pow, met, ...), one row per sample and one column per numeric channel
+    """
+
+    def __init__(self, columns, capacity=1024):
+        """
+        Preallocates the arrays
+        :param columns: column names of the stream (cols of the subscribe response), the list valued "MARKERS"
+                        column at the end of the eeg samples and nested columns (e.g. the contact quality of "dev")
+                        are not buffered
+        :param capacity: max number of buffered samples, the oldest sample is overwritten when the buffer is full
+        """
+        self.source_columns = list(columns)
+        # indices of the buffered columns in the samples, selected once per stream
+        self.indices = [index for index, name in enumerate(columns) if isinstance(name, str) and name != "MARKERS"]
+        self.columns = [columns[index] for index in self.indices]
+        self.column_count = len(self.columns)
+        # the buffered columns are the first ones (eeg, pow, ...) -> slice instead of picking single values
+        self.prefix = self.indices == list(range(self.column_count))
+        self.capacity = capacity
+
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.full((capacity, self.column_count), np.nan, dtype=np.float64)
+
+        self.head = 0
+        self.size = 0
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def push_many(self, samples):
+        """
+        Function to add the samples of a reactor tick with one array conversion and one lock acquisition
+        :param samples: list of tuples (cortex time, list of values), values that are missing (None) or not numeric
+                        (e.g. the expressions of "fac") become NaN
+        """
+        received = count = len(samples)
+        if count == 0:
+            return
+        if count > self.capacity:
+            samples = samples[-self.capacity:]
+            count = self.capacity
+
+        times = np.fromiter((sample[0] for sample in samples), dtype=np.float64, count=count)
+        if self.prefix:
+            rows = [sample[1][:self.column_count] for sample in samples]
+        else:
+            rows = [[sample[1][index] if index < len(sample[1]) else None for index in self.indices]
+                    for sample in samples]
+        try:
+            values = np.array(rows, dtype=np.float64)
+        except (ValueError, TypeError):
+            # text values or samples with fewer values than columns
+            values = np.array([self.numeric_row(row) for row in rows], dtype=np.float64)
+
+        with self.lock:
+            # at most two slices: up to the end of the arrays and from the start
+            first = min(count, self.capacity - self.head)
+            self.times[self.head:self.head + first] = times[:first]
+            self.values[self.head:self.head + first] = values[:first]
+            if first < count:
+                self.times[:count - first] = times[first:]
+                self.values[:count - first] = values[first:]
+
+            self.head = (self.head + count) % self.capacity
+            self.size = min(self.capacity, self.size + count)
+            self.total += received
+
+    def numeric_row(self, row):
+        """
+        Function that converts the values of a sample value by value
+        :param row: list of values
+        :return: list of column_count floats, NaN for missing and non numeric values
+        """
+        numbers = []
+        for value in row[:self.column_count]:
+            try:
+                numbers.append(float(value))
+            except (TypeError, ValueError):
+                numbers.append(np.nan)
+        return numbers + [np.nan] * (self.column_count - len(numbers))
+
+    def latest(self, count=None):
+        """
+        Function for the newest samples (oldest first), copies that can be used without the lock
+        :param count: number of samples (default: all buffered)
+        :return: tuple (times array, values array with one row per sample)
+        """
+        with self.lock:
+            if count is None or count > self.size:
+                count = self.size
+            indices = np.arange(self.head - count, self.head) % self.capacity
+            return self.times[indices], self.values[indices]
+
+    def column(self, name):
+        """
+        :param name: column name (e.g. "AF3" or "AF3/alpha")
+        :return: index of the column in the values array
+        """
+        return self.columns.index(name)
+
+    def __len__(self):
+        return self.size
+
+    def stats(self):
+        """
+        Function for the buffer counters
+        :return: dict with buffered and received sample counts
+        """
+        return {
+            "columns": self.column_count,
+            "buffered": self.size,
+            "received": self.total
+        }
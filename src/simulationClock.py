@@ -0,0 +1,68 @@
+import time
+
+
+class SimulationClock:
+    """
+    Fixed timestep clock for the game simulation: real frame time is collected in an accumulator and the
+    simulation advances in steps of the same length, independent of the frame rate
+    """
+    step_ms = 1000.0 / 120
+    # avoids a spiral of death after a long stall (e.g. window moved)
+    max_steps_per_frame = 12
+
+    def __init__(self):
+        """
+        Initializes simulation time and accumulator
+        """
+        self.time = 0.0
+        self.accumulator = 0.0
+        self.time_last_frame = None
+        # fixed frame time in ms instead of real time (headless mode -> deterministic and faster than real time)
+        self.virtual_frame_ms = None
+
+    def get_ticks(self):
+        """
+        Function with the same meaning as pygame.time.get_ticks(), but in simulation time
+        :return: simulation time in milliseconds
+        """
+        return int(self.time)
+
+    def begin_frame(self):
+        """
+        Function that adds the time since the last frame to the accumulator
+        :return: number of simulation steps for this frame
+        """
+        if self.virtual_frame_ms is not None:
+            elapsed = self.virtual_frame_ms
+        else:
+            now = time.perf_counter() * 1000.0
+            elapsed = 0.0 if self.time_last_frame is None else now - self.time_last_frame
+            self.time_last_frame = now
+
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps_per_frame:
+            # drop the simulation time that can't be caught up
+            steps = self.max_steps_per_frame
+            self.accumulator = steps * self.step_ms
+        return steps
+
+    def step(self):
+        """
+        Function for a single simulation step
+        :return: step length in seconds
+        """
+        self.accumulator -= self.step_ms
+        self.time += self.step_ms
+        return self.step_ms / 1000.0
+
+    def alpha(self):
+        """
+        Function for the interpolation between the last two simulation steps
+        :return: 0.0 (previous step) to 1.0 (current step)
+        """
+        return min(1.0, self.accumulator / self.step_ms)
+
+
+# shared by all game logic timers (GameState, Player, GameObjectManager, screens)
+simulation_clock = SimulationClock()
@@ -0,0 +1,111 @@
+import logging
+import time
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+
+class SoundBank:
+    """
+    Class that loads every sound effect once at startup and plays it on reserved mixer channels
+    """
+    effects = {
+        "chime": "sound/magic-chime.wav",
+        "buzzer": "sound/fail-buzzer.wav"
+    }
+    frequency = 44100
+    buffer_size = 512
+    reserved_channels = 4
+
+    def __init__(self):
+        """
+        Initializes the sound and channel pools and the latency counters
+        """
+        self.sounds = {}
+        self.channels = []
+        self.next_channel = 0
+        self.play_count = 0
+        self.play_time_total = 0.0
+        self.play_time_max = 0.0
+
+    @classmethod
+    def pre_init(cls, buffer_size=None, frequency=None):
+        """
+        Function to set up a small mixer buffer for low latency, has to be called before pygame.init()
+        :param buffer_size: mixer buffer in samples (power of two)
+        :param frequency: sample rate
+        """
+        if buffer_size:
+            cls.buffer_size = buffer_size
+        if frequency:
+            cls.frequency = frequency
+        pygame.mixer.pre_init(cls.frequency, -16, 2, cls.buffer_size)
+
+    def load(self):
+        """
+        Function that decodes all effects and reserves the mixer channels (needs an initialized mixer)
+        """
+        if not pygame.mixer.get_init():
+            logger.warning("mixer not initialized, sound effects disabled")
+            return
+
+        for name, path in self.effects.items():
+            self.sounds[name] = pygame.mixer.Sound(path)
+
+        # reserved channels are never taken by pygame.mixer.Sound.play() or find_channel()
+        pygame.mixer.set_reserved(self.reserved_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.reserved_channels)]
+
+    def play(self, name):
+        """
+        Function to play an effect on the next free reserved channel (or the oldest one if all are busy)
+        :param name: name of the effect (key of effects)
+        """
+        sound = self.sounds.get(name)
+        if sound is None or not self.channels:
+            return
+
+        start = time.perf_counter()
+
+        channel = None
+        for i in range(len(self.channels)):
+            candidate = self.channels[(self.next_channel + i) % len(self.channels)]
+            if not candidate.get_busy():
+                channel = candidate
+                break
+        if channel is None:
+            channel = self.channels[self.next_channel]
+        self.next_channel = (self.channels.index(channel) + 1) % len(self.channels)
+        channel.play(sound)
+
+        elapsed = time.perf_counter() - start
+        self.play_count += 1
+        self.play_time_total += elapsed
+        self.play_time_max = max(self.play_time_max, elapsed)
+
+    def latency(self):
+        """
+        Function for the latency measurement: mixer buffer latency (time until a started sound is audible)
+        and the time spent in play() on the game loop
+        :return: dict with latencies in milliseconds
+        """
+        init = pygame.mixer.get_init()
+        frequency = init[0] if init else self.frequency
+        play_avg = (self.play_time_total / self.play_count) if self.play_count else 0.0
+        return {
+            "buffer_ms": self.buffer_size * 1000.0 / frequency,
+            "play_avg_ms": play_avg * 1000.0,
+            "play_max_ms": self.play_time_max * 1000.0,
+            "plays": self.play_count
+        }
+
+    def report(self):
+        """
+        Logs the latency measurement
+        """
+        logger.info("sound bank latency: %s", self.latency())
+
+
+# shared by the game loop and the GameObjectManager
+sounds = SoundBank()
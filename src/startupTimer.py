@@ -0,0 +1,50 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Class that measures the time of every startup phase from the import of the game module to the first
+    interactive menu frame
+    """
+
+    def __init__(self):
+        self.time_start = time.perf_counter()
+        self.time_last_mark = self.time_start
+        # list of tuples (phase, seconds)
+        self.phases = []
+        self.running = True
+
+    def mark(self, phase):
+        """
+        Function that adds the time since the last mark as a phase
+        :param phase: name of the finished phase
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.time_last_mark))
+        self.time_last_mark = now
+
+    def finish(self):
+        """
+        Function to call after the first frame: ends the measurement and logs the report
+        """
+        self.mark("first frame")
+        self.running = False
+        logger.info("%s", self.report())
+
+    def report(self):
+        """
+        Function that creates the startup report
+        :return: report text
+        """
+        total = self.time_last_mark - self.time_start
+        lines = ["startup: {0:.0f} ms to the first frame".format(total * 1000.0)]
+        for phase, seconds in self.phases:
+            lines.append("  {0:<14} {1:8.1f} ms".format(phase, seconds * 1000.0))
+        return "\n".join(lines)
+
+
+# created by the first import -> the import time of the game modules is the first phase
+startup_timer = StartupTimer()
@@ -0,0 +1,128 @@
+import math
+
+
+class RunningStats:
+    """
+    Class for the running count, mean, variance, min and max of a stream of values (Welford's algorithm),
+    O(1) memory and no loss of precision for long streams
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        # sum of the squared differences from the mean
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        """
+        Function to add a new value
+        :param value: float
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self):
+        """
+        Sample variance (0 for less than two values)
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Class for the streaming estimate of a quantile without storing the values (P² algorithm of Jain and Chlamtac):
+    five markers follow the min, p/2, p, (1+p)/2 quantiles and the max and are adjusted with a parabolic
+    interpolation for every new value
+    """
+
+    def __init__(self, p):
+        """
+        :param p: quantile between 0 and 1 (0.5 -> median)
+        """
+        self.p = p
+        self.count = 0
+        # marker heights, actual and desired marker positions and the increments of the desired positions
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        """
+        Function to add a new value
+        :param value: float
+        """
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # cell of the new value, the outer markers follow the min and max
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self.positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # move the middle markers to their desired positions
+        for i in range(1, 4):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self.parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self.linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def parabolic(self, i, step):
+        heights = self.heights
+        positions = self.positions
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) /
+            (positions[i + 1] - positions[i]) +
+            (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) /
+            (positions[i] - positions[i - 1]))
+
+    def linear(self, i, step):
+        heights = self.heights
+        positions = self.positions
+        return heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+
+    def value(self):
+        """
+        :return: estimated quantile (exact for up to five values, None without values)
+        """
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            # nearest rank of the sorted values
+            return self.heights[min(self.count - 1, int(round(self.p * (self.count - 1))))]
+        return self.heights[2]
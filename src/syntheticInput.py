@@ -0,0 +1,62 @@
+import random
+import time
+
+
+class SyntheticInputSource:
+    """
+    Class that replaces the CortexClient with random mental command samples (headless mode, profiling)
+    """
+    commands = ["neutral", "left", "right"]
+
+    def __init__(self, rate=8.0, seed=None, target=None, clock=time.monotonic):
+        """
+        :param rate: samples per second (the cortex "com" stream has 8 samples per second)
+        :param seed: seed for reproducible samples
+        :param target: optional function that returns (target x, player x) or None -> the samples steer the player
+                       to the target instead of being random (autopilot to finish games)
+        :param clock: function that returns the current time in seconds
+        """
+        self.rate = rate
+        self.random = random.Random(seed)
+        self.target = target
+        self.clock = clock
+        self.time_last_sample = None
+
+    def poll(self, receiver):
+        """
+        Function that hands over all samples due since the last poll as one batch
+        :param receiver: InputManager
+        """
+        now = self.clock()
+        if self.time_last_sample is None:
+            self.time_last_sample = now
+            return
+
+        count = int((now - self.time_last_sample) * self.rate)
+        if count <= 0:
+            return
+        self.time_last_sample += count / self.rate
+
+        samples = []
+        for _ in range(count):
+            samples.append(self.next_sample())
+        receiver.on_receive_cortex_batch(samples)
+
+    def next_sample(self):
+        """
+        Function for a single sample
+        :return: tuple (command, power, cortex time)
+        """
+        positions = self.target() if self.target else None
+        if positions is None:
+            return self.random.choice(self.commands), self.random.random(), time.time()
+
+        target_x, player_x = positions
+        # half of a lane
+        if target_x < player_x - 95:
+            command = "left"
+        elif target_x > player_x + 95:
+            command = "right"
+        else:
+            command = "neutral"
+        return command, 1.0, time.time()
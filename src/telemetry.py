@@ -0,0 +1,169 @@
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from src.streamingStats import RunningStats, P2Quantile
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions (id INTEGER PRIMARY KEY, started REAL, players INTEGER, mode TEXT)",
+    "CREATE TABLE IF NOT EXISTS events (session INTEGER, time REAL, game INTEGER, kind TEXT, player INTEGER, "
+    "value REAL, data TEXT)"
+)
+
+
+class TelemetrySink:
+    """
+    Class for the append-only telemetry of the game sessions (spawns, input events, collisions, scores):
+    the game loop puts the events into a bounded queue without blocking, a background thread writes them into a
+    SQLite file in batched transactions
+    """
+    # events of one transaction and max. seconds an event waits for its transaction
+    batch_size = 512
+    flush_interval = 1.0
+    # a full queue drops events instead of stalling the frame
+    max_queue = 20000
+
+    def __init__(self):
+        self.enabled = False
+        self.events = None
+        self.writer = None
+        self.path = None
+        # number of the current game of the session
+        self.game = 0
+
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.flush_stats = RunningStats()
+        self.flush_p95 = P2Quantile(0.95)
+
+    def open(self, path, players=1, mode=""):
+        """
+        Function that starts the writer thread, the file and the tables are created by the thread
+        :param path: path of the SQLite file (existing sessions are kept)
+        :param players: number of players of the session
+        :param mode: multiplayer mode of the session
+        """
+        self.path = path
+        self.events = queue.Queue(self.max_queue)
+        self.writer = threading.Thread(target=self.write_events, args=(players, mode), name="telemetry",
+                                       daemon=True)
+        # before the start, a failed connect of the thread disables the telemetry again
+        self.enabled = True
+        self.writer.start()
+        atexit.register(self.close)
+
+    def record(self, kind, player=None, value=None, data=None):
+        """
+        Function to add an event (never blocks)
+        :param kind: event type ("spawn", "input", "collision", "start", "end")
+        :param player: index of the player
+        :param value: numeric value of the event (e.g. weight of an input, penalty, score time)
+        :param data: text of the event (e.g. direction, object type)
+        """
+        if not self.enabled:
+            return
+        try:
+            self.events.put_nowait((time.time(), self.game, kind, player, value, data))
+        except queue.Full:
+            self.dropped += 1
+
+    def write_events(self, players, mode):
+        """
+        Writer thread: collects up to batch_size events (or the events of flush_interval seconds) and writes them
+        in one transaction until close() puts None
+        """
+        try:
+            connection = sqlite3.connect(self.path)
+            # no fsync per transaction, the telemetry may lose the last transactions of a crash
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+                session = connection.execute("INSERT INTO sessions (started, players, mode) VALUES (?, ?, ?)",
+                                             (time.time(), players, mode)).lastrowid
+        except sqlite3.Error as error:
+            # the game keeps running without telemetry
+            self.enabled = False
+            logger.error("telemetry disabled, %s not writable: %s", self.path, error)
+            return
+
+        running = True
+        while running:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    event = self.events.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if event is None:
+                    running = False
+                    break
+                batch.append((session,) + event)
+            if not batch:
+                continue
+
+            self.max_depth = max(self.max_depth, self.events.qsize())
+            start = time.perf_counter()
+            try:
+                with connection:
+                    connection.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            except sqlite3.Error as error:
+                self.enabled = False
+                logger.error("telemetry disabled, events not written: %s", error)
+                break
+            flush_ms = (time.perf_counter() - start) * 1000.0
+            self.flush_stats.add(flush_ms)
+            self.flush_p95.add(flush_ms)
+            self.written += len(batch)
+            self.batches += 1
+        connection.close()
+
+    def close(self):
+        """
+        Function that writes the remaining events and stops the writer thread
+        """
+        self.enabled = False
+        if self.writer is None or not self.writer.is_alive():
+            return
+        try:
+            self.events.put(None, timeout=self.flush_interval * 2)
+        except queue.Full:
+            logger.warning("telemetry: writer stalled, %d events not written", self.events.qsize())
+            return
+        self.writer.join()
+
+    def stats(self):
+        """
+        Function for the queue and writer counters
+        :return: dict with queue depth (current and max), dropped and written events, batches and flush latency
+        """
+        return {
+            "queued": self.events.qsize() if self.events is not None else 0,
+            "max_depth": self.max_depth,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "flush_avg_ms": round(self.flush_stats.mean, 3),
+            "flush_p95_ms": round(self.flush_p95.value(), 3) if self.flush_stats.count else None,
+            "flush_max_ms": round(self.flush_stats.max, 3) if self.flush_stats.count else None
+        }
+
+    def report(self):
+        """
+        Logs the queue and writer counters
+        """
+        if self.enabled:
+            logger.info("telemetry: %s", self.stats())
+
+
+# shared by the game loop and the object managers
+telemetry = TelemetrySink()
@@ -0,0 +1,38 @@
+from src.calibrationProfiles import CalibrationProfiles
+
+
+def profile(left, right, max_left=1.0, max_right=1.0):
+    return {"left": left, "right": right, "summary": {"LEFT": {"max": max_left}, "RIGHT": {"max": max_right}}}
+
+
+def test_store_and_get(tmp_path):
+    profiles = CalibrationProfiles(str(tmp_path / "profiles.json"))
+    assert profiles.store("alice", "INSIGHT-1", profile(0.5, 0.6))
+
+    loaded = CalibrationProfiles(str(tmp_path / "profiles.json"))
+    loaded.load()
+    assert loaded.get("alice", "INSIGHT-1")["right"] == 0.6
+    assert loaded.get("alice", "INSIGHT-2") is None
+    assert loaded.get("bob", "INSIGHT-1") is None
+
+
+def test_degenerate_thresholds_are_neither_stored_nor_applied(tmp_path):
+    path = tmp_path / "profiles.json"
+    profiles = CalibrationProfiles(str(path))
+    assert not profiles.store("alice", "INSIGHT-1", profile(1.0, 1.0))
+    assert not profiles.store("alice", "INSIGHT-1", profile(0.5, 0.8, max_right=0.8))
+    assert not profiles.store("alice", "INSIGHT-1", profile(0.0, 0.5))
+    assert not path.exists()
+
+    path.write_text('{"alice/INSIGHT-1": {"left": 1.0, "right": 0.5, "time": 9e99}}')
+    profiles.load()
+    assert profiles.get("alice", "INSIGHT-1") is None
+
+
+def test_load_ignores_files_without_profiles(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text("[1, 2, 3]")
+    profiles = CalibrationProfiles(str(path))
+    profiles.load()
+    assert profiles.profiles == {}
+    assert profiles.get("alice", "INSIGHT-1") is None
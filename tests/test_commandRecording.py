@@ -0,0 +1,24 @@
+import pytest
+
+from src.cortex.commandRecording import CommandRecorder, CommandRecording
+
+
+def test_recording_round_trip(tmp_path):
+    path = str(tmp_path / "session.rec")
+    recorder = CommandRecorder(path)
+    recorder.record("left", 0.5, 1000.0, arrival_time=10.0)
+    recorder.record("right", 0.25, 1000.5, arrival_time=10.5)
+    recorder.close()
+
+    recording = CommandRecording(path)
+    assert len(recording) == 2
+    assert recording[1] == (0.5, 1000.5, "right", 0.25)
+    recording.close()
+
+
+@pytest.mark.parametrize("content", [b"", b"FRCOM\x00\x01", b"NOTREC\x01\x00" + bytes(28)])
+def test_invalid_recording_raises_value_error(tmp_path, content):
+    path = tmp_path / "broken.rec"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        CommandRecording(str(path))
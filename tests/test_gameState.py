@@ -0,0 +1,34 @@
+from src.gameState import GameState
+from src.input import Input
+from src.player import Player
+from src.simulationClock import simulation_clock
+
+
+def calibrate(game_state, powers_left, powers_right):
+    game_state.reset_signal_weight()
+    for power in powers_left:
+        game_state.update_signal_weight((Input.LEFT, power), Input.LEFT)
+    for power in powers_right:
+        game_state.update_signal_weight((Input.RIGHT, power), Input.RIGHT)
+
+
+def test_keyboard_calibration_keeps_the_keyboard_playable():
+    game_state = GameState()
+    calibrate(game_state, [1.0] * 20, [1.0] * 20)
+
+    assert game_state.min_signal_weight_left < 1.0
+    assert game_state.min_signal_weight_right < 1.0
+
+    player = Player()
+    start = player.rect.centerx
+    simulation_clock.time = player.time_last_move + 2000.0
+    player.update((Input.RIGHT, 1.0), game_state)
+    assert player.rect.centerx == start + 190
+
+
+def test_threshold_is_below_the_calibration_max():
+    game_state = GameState()
+    calibrate(game_state, [0.4, 0.5, 0.6, 0.5, 0.45, 0.55, 0.5], [0.9] * 10)
+
+    assert 0.0 < game_state.min_signal_weight_left < 0.6
+    assert 0.0 < game_state.min_signal_weight_right < 0.9
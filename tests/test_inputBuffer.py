@@ -0,0 +1,37 @@
+import time
+
+from src.inputBuffer import InputRingBuffer
+
+
+def test_drain_returns_the_samples_in_order_after_wraparound():
+    buffer = InputRingBuffer(capacity=4)
+    buffer.push_many([("left", 0.1, 1.0), ("right", 0.2, 2.0), ("left", 0.3, 3.0)], arrival_time=10.0)
+    assert [sample[3] for sample in buffer.drain(now=10.0)] == [0.1, 0.2, 0.3]
+
+    # head is at index 3 -> these samples wrap around the end of the arrays
+    buffer.push_many([("neutral", 0.4, 4.0), ("right", 0.5, 5.0), ("left", 0.6, 6.0)], arrival_time=11.0)
+    assert buffer.drain(now=11.0) == [(11.0, 4.0, "neutral", 0.4), (11.0, 5.0, "right", 0.5),
+                                      (11.0, 6.0, "left", 0.6)]
+    assert len(buffer) == 0
+
+
+def test_full_buffer_drops_the_oldest_sample():
+    buffer = InputRingBuffer(capacity=3)
+    for index in range(5):
+        buffer.push("left", index / 10.0, float(index), arrival_time=10.0)
+
+    assert len(buffer) == 3
+    assert [sample[1] for sample in buffer.drain(now=10.0)] == [2.0, 3.0, 4.0]
+    assert buffer.stats()["overflow"] == 2
+
+
+def test_stale_samples_are_dropped(monkeypatch):
+    buffer = InputRingBuffer(capacity=8, max_age=1.0)
+    monkeypatch.setattr(time, "monotonic", lambda: 100.0)
+    buffer.push("left", 0.5, 1.0)
+    monkeypatch.setattr(time, "monotonic", lambda: 100.8)
+    buffer.push("right", 0.7, 2.0)
+
+    monkeypatch.setattr(time, "monotonic", lambda: 101.5)
+    assert buffer.drain() == [(100.8, 2.0, "right", 0.7)]
+    assert buffer.stats() == {"buffered": 0, "overflow": 0, "stale": 1}
@@ -0,0 +1,26 @@
+import math
+
+from src.logPipeline import BinaryEventLog, read_events
+
+
+def test_event_log_keeps_one_value_per_column(tmp_path):
+    path = str(tmp_path / "events.bin")
+    event_log = BinaryEventLog()
+    event_log.open(path)
+    event_log.record("com", 1.0, ["left", 0.75])
+    event_log.record("fac", 2.0, ["neutral", "smile", 0.5, "neutral", 0.25])
+    event_log.record("dev", 3.0, [4, 1.0, [4, 4, 2], 80])
+    event_log.record("met", 4.0, [True, 0.5, None, 0.3])
+    event_log.close()
+
+    events = list(read_events(path))
+    assert [(stream, cortex_time) for stream, cortex_time, values in events] == \
+        [("com", 1.0), ("fac", 2.0), ("dev", 3.0), ("met", 4.0)]
+    assert events[0][2] == (1.0, 0.75)
+
+    fac = events[1][2]
+    assert len(fac) == 5 and fac[2] == 0.5 and fac[4] == 0.25 and math.isnan(fac[1])
+    dev = events[2][2]
+    assert len(dev) == 4 and dev[3] == 80.0 and math.isnan(dev[2])
+    met = events[3][2]
+    assert len(met) == 4 and met[0] == 1.0 and math.isnan(met[2])
@@ -0,0 +1,59 @@
+from src.objectManager import GameObjectManager
+from src.objectType import GameObjectType
+from src.player import Player
+
+
+def create_manager(monkeypatch):
+    manager = GameObjectManager(list(GameObjectType))
+    caught = []
+    monkeypatch.setattr(manager, "on_collision", lambda object_type, player: caught.append(object_type))
+    return manager, caught
+
+
+def test_player_catches_the_lowest_object_of_its_lane(monkeypatch):
+    manager, caught = create_manager(monkeypatch)
+    # lane 0 (x 94) is below the player at x 100, lane 3 is out of reach
+    lowest = manager.generate_new_object(lane=0, y=660)
+    above = manager.generate_new_object(lane=0, y=400)
+    other_lane = manager.generate_new_object(lane=3, y=660)
+
+    manager.update([Player()], 0.0)
+
+    assert caught == [GameObjectType(int(manager.store.types[lowest]))]
+    assert list(manager.lanes[0]) == [above]
+    assert list(manager.lanes[3]) == [other_lane]
+    assert manager.object_count == 2
+
+
+def test_objects_above_the_player_are_not_caught(monkeypatch):
+    manager, caught = create_manager(monkeypatch)
+    manager.generate_new_object(lane=0, y=400)
+    manager.generate_new_object(lane=0, y=100)
+
+    manager.update([Player()], 0.0)
+
+    assert caught == []
+    assert manager.object_count == 2
+
+
+def test_objects_at_the_bottom_are_removed(monkeypatch):
+    manager, caught = create_manager(monkeypatch)
+    manager.generate_new_object(lane=1, y=760)
+    remaining = manager.generate_new_object(lane=1, y=300)
+
+    manager.update([Player(start_x=600)], 0.0)
+
+    assert list(manager.lanes[1]) == [remaining]
+    assert manager.object_count == 1
+
+
+def test_lowest_object_of_a_type():
+    manager = GameObjectManager(list(GameObjectType))
+    for lane, y in ((0, 200), (1, 500), (2, 720)):
+        slot = manager.generate_new_object(lane=lane, y=y)
+        manager.store.types[slot] = GameObjectType.APPLE
+
+    # the top of the object in lane 2 (672) is below the line
+    assert manager.lowest_object(GameObjectType.APPLE, 650) == (281.0, 500.0)
+    assert manager.lowest_object(GameObjectType.APPLE, 700) == (469.0, 720.0)
+    assert manager.lowest_object(GameObjectType.BANANA, 650) is None
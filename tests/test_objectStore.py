@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.objectStore import ObjectStore
+
+
+def test_released_slots_are_reused():
+    store = ObjectStore(capacity=4)
+    first = store.spawn(1, 94.0, 0.0)
+    second = store.spawn(2, 281.0, 0.0)
+    assert (first, second) == (0, 1)
+
+    store.release(first)
+    assert store.count == 1
+    assert not store.alive[first]
+    assert store.spawn(3, 469.0, 10.0) == first
+    assert store.types[first] == 3
+    assert store.y[first] == store.previous_y[first] == 10.0
+
+
+def test_store_grows_past_the_initial_capacity():
+    store = ObjectStore(capacity=2)
+    slots = [store.spawn(index % 6 + 1, 94.0, float(index)) for index in range(5)]
+
+    assert slots == [0, 1, 2, 3, 4]
+    assert len(store.alive) == 8
+    assert store.count == 5
+    # values of the slots before the growth are kept
+    assert store.y[:5].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert store.alive_slots().tolist() == slots
+
+
+def test_move_and_below_only_select_alive_objects():
+    store = ObjectStore(capacity=4)
+    store.spawn(1, 94.0, 700.0)
+    dead = store.spawn(2, 281.0, 700.0)
+    store.spawn(3, 469.0, 100.0)
+    store.release(dead)
+
+    store.move(30.0)
+    assert store.y[[0, 2]].tolist() == [730.0, 130.0]
+    assert store.previous_y[[0, 2]].tolist() == [700.0, 100.0]
+    assert store.y[dead] == 700.0
+    assert np.flatnonzero(store.below(770, 48)).tolist() == [0]
+    assert store.interpolated_y(np.array([0, 2]), 0.5).tolist() == [715.0, 115.0]
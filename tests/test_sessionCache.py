@@ -0,0 +1,84 @@
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from src.cortex.sessionCache import SessionCache
+
+
+def test_store_and_load(tmp_path):
+    cache = SessionCache(str(tmp_path / "session.json"))
+    cache.store(["EPOC-1"], "token", ["session-1"])
+
+    entry = cache.load()
+    assert entry["headset_ids"] == ["EPOC-1"]
+    assert entry["auth_token"] == "token"
+    assert entry["session_ids"] == ["session-1"]
+
+
+def test_cache_file_is_readable_by_the_owner_only(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text("{}")
+    os.chmod(path, 0o644)
+
+    SessionCache(str(path)).store(["EPOC-1"], "token")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_expired_session_keeps_the_token(tmp_path, monkeypatch):
+    cache = SessionCache(str(tmp_path / "session.json"), token_ttl=3600, session_ttl=600)
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    cache.store(["EPOC-1"], "token", ["session-1"])
+
+    monkeypatch.setattr(time, "time", lambda: 1000.0 + 601)
+    entry = cache.load()
+    assert entry["auth_token"] == "token"
+    assert entry["session_ids"] is None
+
+    monkeypatch.setattr(time, "time", lambda: 1000.0 + 3601)
+    assert cache.load() is None
+
+
+def test_new_token_restarts_the_token_ttl(tmp_path, monkeypatch):
+    cache = SessionCache(str(tmp_path / "session.json"), token_ttl=3600)
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    cache.store(["EPOC-1"], "token")
+    monkeypatch.setattr(time, "time", lambda: 4000.0)
+    cache.store(["EPOC-1"], "new token")
+
+    monkeypatch.setattr(time, "time", lambda: 5000.0)
+    assert cache.load()["auth_token"] == "new token"
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    "[]",
+    json.dumps({"headset_ids": ["EPOC-1"], "time_token": 1e12}),
+    json.dumps({"auth_token": "token", "headset_ids": "EPOC-1", "time_token": 1e12}),
+    json.dumps({"auth_token": "token", "headset_ids": ["EPOC-1"], "time_token": "now"}),
+])
+def test_corrupt_cache_is_ignored(tmp_path, content):
+    path = tmp_path / "session.json"
+    path.write_text(content)
+    assert SessionCache(str(path)).load() is None
+
+
+def test_sessions_of_other_headsets_are_dropped(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"auth_token": "token", "headset_ids": ["EPOC-1", "EPOC-2"],
+                                "session_ids": ["session-1"], "time_token": time.time(),
+                                "time_session": time.time()}))
+
+    entry = SessionCache(str(path)).load()
+    assert entry["auth_token"] == "token"
+    assert entry["session_ids"] is None
+
+
+def test_invalidate_removes_the_cache(tmp_path):
+    cache = SessionCache(str(tmp_path / "session.json"))
+    cache.store(["EPOC-1"], "token")
+    cache.invalidate()
+    assert cache.load() is None
+    cache.invalidate()
@@ -0,0 +1,33 @@
+import math
+
+from src.signalBuffer import SignalRingBuffer
+
+
+def test_eeg_markers_are_not_buffered():
+    buffer = SignalRingBuffer(["COUNTER", "AF3", "T7", "MARKERS"], capacity=4)
+    buffer.push_many([(1.0, [1, 4000.5, 4100.5, []]), (2.0, [2, 4001.5, 4101.5, []])])
+
+    times, values = buffer.latest()
+    assert buffer.columns == ["COUNTER", "AF3", "T7"]
+    assert times.tolist() == [1.0, 2.0]
+    assert values[1].tolist() == [2.0, 4001.5, 4101.5]
+
+
+def test_mixed_type_streams():
+    # dev: nested contact quality column, fac: text columns, met: missing values
+    dev = SignalRingBuffer(["Battery", "Signal", ["AF3", "T7", "Pz"], "BatteryPercent"])
+    dev.push_many([(1.0, [4, 1.0, [4, 4, 2], 80])])
+    assert dev.columns == ["Battery", "Signal", "BatteryPercent"]
+    assert dev.latest()[1][0].tolist() == [4.0, 1.0, 80.0]
+
+    fac = SignalRingBuffer(["eyeAct", "uAct", "uPow", "lAct", "lPow"])
+    fac.push_many([(1.0, ["neutral", "surprise", 0.5, "smile", 0.8]), (2.0, ["blink", "neutral", 0.1])])
+    times, values = fac.latest()
+    assert len(fac) == 2
+    assert values[0, 2] == 0.5 and values[0, 4] == 0.8
+    assert math.isnan(values[0, 0]) and math.isnan(values[1, 4])
+
+    met = SignalRingBuffer(["eng.isActive", "eng", "exc.isActive", "exc"])
+    met.push_many([(1.0, [True, 0.5, False, None])])
+    assert met.latest()[1][0, :3].tolist() == [1.0, 0.5, 0.0]
+    assert math.isnan(met.latest()[1][0, 3])
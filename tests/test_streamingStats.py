@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.streamingStats import RunningStats, P2Quantile
+
+
+@pytest.mark.parametrize("p", [0.25, 0.5, 0.95])
+def test_p2_quantile_follows_numpy_percentile(p):
+    values = np.random.default_rng(7).normal(0.5, 0.15, 5000)
+    quantile = P2Quantile(p)
+    for value in values:
+        quantile.add(value)
+
+    assert quantile.value() == pytest.approx(np.percentile(values, p * 100), abs=0.01)
+
+
+def test_p2_quantile_of_a_skewed_stream():
+    values = np.random.default_rng(11).exponential(1.0, 5000)
+    quantile = P2Quantile(0.25)
+    for value in values:
+        quantile.add(value)
+
+    assert quantile.value() == pytest.approx(np.percentile(values, 25), rel=0.05)
+
+
+def test_p2_quantile_of_up_to_five_values_is_exact():
+    quantile = P2Quantile(0.25)
+    assert quantile.value() is None
+
+    values = [0.9, 0.1, 0.5, 0.7, 0.3]
+    for count, value in enumerate(values, 1):
+        quantile.add(value)
+        assert quantile.value() == np.percentile(values[:count], 25, method="nearest")
+
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(3).uniform(0.0, 1.0, 1000)
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(np.mean(values))
+    assert stats.variance == pytest.approx(np.var(values, ddof=1))
+    assert stats.std == pytest.approx(np.std(values, ddof=1))
+    assert stats.min == values.min()
+    assert stats.max == values.max()
+
+
+def test_running_stats_of_one_value():
+    stats = RunningStats()
+    stats.add(0.4)
+    assert stats.mean == 0.4
+    assert stats.variance == 0.0
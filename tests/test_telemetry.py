@@ -0,0 +1,27 @@
+import threading
+
+from src.telemetry import TelemetrySink
+
+
+def test_unwritable_path_disables_telemetry(tmp_path):
+    sink = TelemetrySink()
+    sink.open(str(tmp_path / "missing" / "telemetry.db"))
+    sink.writer.join(timeout=5.0)
+    assert not sink.writer.is_alive()
+    assert not sink.enabled
+
+    sink.record("spawn", 0, 1.0, "apple")
+    # close() must not block on the dead writer
+    closer = threading.Thread(target=sink.close, daemon=True)
+    closer.start()
+    closer.join(timeout=5.0)
+    assert not closer.is_alive()
+
+
+def test_close_writes_remaining_events(tmp_path):
+    sink = TelemetrySink()
+    sink.open(str(tmp_path / "telemetry.db"))
+    for index in range(10):
+        sink.record("input", 0, index, "left")
+    sink.close()
+    assert sink.written == 10
@@ -0,0 +1,76 @@
+"""
+Messages-per-second benchmark of the Cortex client ingest path (CortexClientProtocol -> InputManager)
+against a local stand-in server.
+
+    python -m tools.ingestBenchmark --messages 200000
+"""
+import argparse
+import logging
+import time
+
+from autobahn.twisted.websocket import listenWS
+from twisted.internet import reactor
+
+from src.cortex.client import CortexClient
+from src.cortex.clientProtocol import CortexClientProtocol
+from src.cortex.standInServer import StandInServerFactory
+from src.inputManager import InputManager
+
+
+class CountingInputManager(InputManager):
+    """
+    InputManager that counts the received samples and stops the reactor after the last one
+    """
+
+    def __init__(self, expected):
+        super(CountingInputManager, self).__init__()
+        self.expected = expected
+        self.received = 0
+        self.time_first = None
+        self.time_last = None
+
+    def on_sample(self, count):
+        if self.time_first is None:
+            self.time_first = time.perf_counter()
+        self.received += count
+        if self.received >= self.expected:
+            self.time_last = time.perf_counter()
+            reactor.stop()
+
+    def on_receive_cortex_data(self, data):
+        super(CountingInputManager, self).on_receive_cortex_data(data)
+        self.on_sample(1)
+
+    def on_receive_cortex_batch(self, samples):
+        super(CountingInputManager, self).on_receive_cortex_batch(samples)
+        self.on_sample(len(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cortex ingest benchmark")
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--port", type=int, default=6869)
+    parser.add_argument("--rate", type=float, default=0, help="samples per second of the server (0 -> max)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--legacy", action="store_true", help="disable the streaming fast path")
+    parser.add_argument("--debug", action="store_true", help="run with logging level DEBUG")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    CortexClientProtocol.streaming_fast_path = not args.legacy
+
+    url = "ws://127.0.0.1:{0}".format(args.port)
+    listenWS(StandInServerFactory(url, rate=args.rate, jitter=args.jitter, max_samples=args.messages))
+
+    receiver = CountingInputManager(args.messages)
+    reactor.callWhenRunning(CortexClient, {"client_id": "", "client_secret": "", "license": "", "debit": 0},
+                            receiver, url)
+    reactor.run()
+
+    duration = receiver.time_last - receiver.time_first
+    print("{0}: {1} messages in {2:.2f} s -> {3:.0f} messages/s".format(
+        "legacy" if args.legacy else "fast path", receiver.received, duration, receiver.received / duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Stress test of the GameObjectManager: spawns thousands of falling objects and measures how the update
+(movement, culling, collision) and render cost grows with the number of objects.
+
+    python -m tools.objectStress --counts 100 1000 5000 10000
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.gameObject import GameObject
+from src.objectManager import GameObjectManager
+from src.objectType import GameObjectType
+from src.player import Player
+from src.simulationClock import SimulationClock
+
+
+def fill(manager, count):
+    """
+    Spawns objects at random heights, lane by lane from the bottom to the top (keeps the lanes ordered by y)
+    """
+    per_lane = [[] for _ in manager.tracks]
+    for _ in range(count):
+        per_lane[random.randrange(len(per_lane))].append(random.uniform(GameObject.start_y, GameObject.bottom - 60))
+    for lane, heights in enumerate(per_lane):
+        for y in sorted(heights, reverse=True):
+            manager.generate_new_object(lane, y)
+
+
+def measure(screen, count, frames):
+    """
+    :return: tuple (update ms/frame, render ms/frame)
+    """
+    manager = GameObjectManager(list(GameObjectType)[:3], max_objects=count)
+    player = Player()
+    fill(manager, count)
+    dt = SimulationClock.step_ms / 1000.0
+
+    time_update = 0.0
+    time_render = 0.0
+    for _ in range(frames):
+        # keep the number of objects (roughly) constant
+        while manager.object_count < count:
+            manager.generate_new_object()
+
+        start = time.perf_counter()
+        manager.update([player], dt)
+        time_update += time.perf_counter() - start
+
+        start = time.perf_counter()
+        manager.render(screen)
+        time_render += time.perf_counter() - start
+
+    return time_update * 1000.0 / frames, time_render * 1000.0 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GameObjectManager stress test")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 5000, 10000])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1024, 768))
+
+    print("{0:>8} {1:>12} {2:>12}".format("objects", "update ms", "render ms"))
+    for count in args.counts:
+        manager_update, manager_render = measure(screen, count, args.frames)
+        print("{0:>8} {1:>12.3f} {2:>12.3f}".format(count, manager_update, manager_render))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Replays a recorded session (python src/mainGameLoop.py --record PATH) through the InputManager.
+
+With --speed > 0 the replay runs on a virtual 60 fps clock, so the computed input events are deterministic
+(the digest changes only if the input handling changes). With --speed 0 all samples are pushed as fast as
+possible to measure the ingest throughput.
+
+    python -m tools.replayBenchmark session.frcom --speed 10
+"""
+import argparse
+import hashlib
+import time
+
+from src.cortex.commandRecording import CommandRecording
+from src.inputManager import InputManager
+from src.replayInput import ReplayInputSource
+
+
+class VirtualClock:
+    """
+    Frame clock that only advances when a frame is done
+    """
+
+    def __init__(self, fps):
+        self.frame_ms = 1000.0 / fps
+        self.time_ms = 0.0
+
+    def advance(self):
+        self.time_ms += self.frame_ms
+
+    def get_ticks(self):
+        return int(self.time_ms)
+
+    def seconds(self):
+        return self.time_ms / 1000.0
+
+
+def replay_timed(recording, speed, fps):
+    """
+    :return: list of computed events (frame, input, weight)
+    """
+    clock = VirtualClock(fps)
+    input_manager = InputManager(ReplayInputSource(recording, speed, clock=clock.seconds))
+    input_manager.get_ticks = clock.get_ticks
+    # the replay runs faster than real time, the arrival times of the samples are not comparable
+    input_manager.input_buffer.max_age = float("inf")
+
+    events = []
+    frame = 0
+    # one more compute interval after the last sample
+    frames_after_end = int(input_manager.cortex_compute_interval / clock.frame_ms) + 1
+    while frames_after_end > 0:
+        clock.advance()
+        frame += 1
+        event = input_manager.on_loop([])
+        if event:
+            events.append((frame, event[0].name, round(event[1], 4)))
+        if input_manager.input_source.is_finished():
+            frames_after_end -= 1
+    return events
+
+
+def replay_throughput(recording):
+    """
+    :return: tuple (samples, seconds)
+    """
+    input_manager = InputManager(ReplayInputSource(recording, speed=0, batch_size=1024))
+    start = time.perf_counter()
+    while not input_manager.input_source.is_finished():
+        input_manager.input_source.poll(input_manager)
+        input_manager.input_buffer.drain()
+    return len(recording), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded mental command session")
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 0 -> throughput measurement")
+    parser.add_argument("--fps", type=int, default=60)
+    args = parser.parse_args()
+
+    recording = CommandRecording(args.recording)
+
+    if args.speed > 0:
+        events = replay_timed(recording, args.speed, args.fps)
+        digest = hashlib.sha1(repr(events).encode('utf8')).hexdigest()
+        left = sum(1 for event in events if event[1] == "LEFT")
+        print("{0} samples -> {1} events ({2} left, {3} right), digest {4}".format(
+            len(recording), len(events), left, len(events) - left, digest))
+    else:
+        samples, duration = replay_throughput(recording)
+        print("{0} samples in {1:.3f} s -> {2:.0f} samples/s".format(samples, duration, samples / duration))
+
+
+if __name__ == "__main__":
+    main()